@@ -1,44 +1,31 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 from ZohoCRMAutomatedAuth import ZohoCRMAutomatedAuth
-from helper import excel_to_json, assign_sales_person_to_areas, separate_and_store_temp, assgin_leads_to_lead_name
+from helper import read_workbook, iter_workbook_chunks, filter_development_records, send_filter_report, split_by_assignment, send_assignment_report, digest_reports_enabled, send_run_digest, create_leads_from_dataframe, ReportSpool
 
-def lead_import(file_path):
-    try: 
-        crm = ZohoCRMAutomatedAuth() 
+def lead_import(file_path=None, df=None, original_file_name=None, send_email=True, progress=None, chunk_size=None):
+    report = _reporter(progress)
+    try:
+        report("connection", status="running")
+        crm = ZohoCRMAutomatedAuth()
         if crm.test_api_connection():
-            file_path = separate_and_store_temp(file_path, True)            
-            temp_path = assign_sales_person_to_areas(excel_file_path=file_path,area_column_name="Area Name", sales_person_column_name="Sales Person")            
-            records = excel_to_json(temp_path)
-            if records: 
-                cmda_success = crm.push_records_to_zoho(records)
-                leads_success = assgin_leads_to_lead_name(temp_path, crm)                
-                if cmda_success and leads_success:
-                    return {
-                        "message": "Records pushed to CMDA and Leads created successfully!",
-                        "statusCode": 200,
-                        "status": True,
-                    }
-                else:
-                    error_msg = []
-                    if not cmda_success:
-                        error_msg.append("Failed to push some CMDA records")
-                    if not leads_success:
-                        error_msg.append("Failed to create some Leads")
-                    
-                    return {
-                        "message": "; ".join(error_msg),
-                        "statusCode": 400,  
-                        "status": False,
-                    }
-            else:
-                return {
-                    "message": "No records found in Excel file",
-                    "statusCode": 400,  
-                    "status": False,
-                }
+            report("connection", status="done")
+            original_file_name = original_file_name or (os.path.basename(file_path) if isinstance(file_path, str) else "input_file.xlsx")
+            chunk_size = chunk_size or int(os.getenv("IMPORT_CHUNK_SIZE", "0"))
+            if df is None and chunk_size:
+                return lead_import_stream(file_path, crm, original_file_name, chunk_size, send_email, progress)
+            if df is None:
+                report("read", status="running")
+                df = read_workbook(file_path)
+                report("read", status="done", rows=len(df))
+            return lead_import_dataframe(df, crm, original_file_name, send_email, progress)
         else:
+            report("connection", status="failed")
             return {
                 "message": "API connection failed!",
-                "statusCode": 400,  
+                "statusCode": 400,
                 "status": False,
                 "data": [{}]
             }
@@ -50,5 +37,202 @@ def lead_import(file_path):
             "data": [{}]
         }
 
+def _reporter(progress):
+    def report(stage, **info):
+        if progress:
+            progress(stage, **info)
+    return report
+
+def _empty_stats():
+    return {"total": 0, "successful": 0, "failed": 0, "skipped": 0, "changed": 0, "seconds": 0}
+
+def _add_stats(totals, stats):
+    # Counts only: per-chunk timings overlap (the CMDA and Leads pushes run side by side), so a
+    # stream's seconds are measured once around the whole stream instead.
+    for key in totals:
+        if key != "seconds":
+            totals[key] += stats.get(key, 0)
+
+def area_fuzzy_match_threshold():
+    # Exact area matching unless fuzzy matching is switched on: a lower threshold changes
+    # which Sales Person gets a lead, so it has to be an explicit choice.
+    return int(os.getenv("AREA_FUZZY_MATCH_THRESHOLD", "100"))
+
+def parallel_push_enabled():
+    return os.getenv("IMPORT_PARALLEL_PUSH", "true").strip().lower() in ("1", "true", "yes")
+
+def push_cmda_records(assigned_df, crm, report):
+    started = time.perf_counter()
+    report("push_cmda", status="running", records=len(assigned_df))
+    crm.push_records_to_zoho(assigned_df)
+    cmda_stats = crm.last_push_stats or {**_empty_stats(), "total": len(assigned_df), "failed": len(assigned_df)}
+    cmda_stats = {**cmda_stats, "seconds": round(time.perf_counter() - started, 2)}
+    report("push_cmda", status="done", **cmda_stats)
+    return cmda_stats
+
+def create_leads_records(assigned_df, crm, report):
+    started = time.perf_counter()
+    report("create_leads", status="running", records=len(assigned_df))
+    try:
+        lead_results = create_leads_from_dataframe(assigned_df, crm)
+        statuses = [result["status"] for result in lead_results]
+        leads_stats = {
+            "total": len(statuses),
+            "successful": statuses.count("success"),
+            "failed": statuses.count("error"),
+            "skipped": statuses.count("skipped"),
+            "changed": statuses.count("changed"),
+        }
+        leads_success = True
+    except Exception as e:
+        print(f"❌ Error in create_leads_from_dataframe: {e}")
+        leads_stats = {**_empty_stats(), "total": len(assigned_df), "failed": len(assigned_df)}
+        leads_success = False
+    leads_stats["seconds"] = round(time.perf_counter() - started, 2)
+    report("create_leads", status="done", **leads_stats)
+    return leads_stats, leads_success
+
+def push_assigned_records(assigned_df, crm, report):
+    # The CMDA module and Leads are written from the same rows and don't depend on each other,
+    # so both streams run side by side. They still share the HTTP connection pool and the
+    # process-wide rate limiter, so together they never exceed the configured Zoho budget.
+    if assigned_df.empty:
+        return _empty_stats(), _empty_stats(), True
+    if not parallel_push_enabled():
+        cmda_stats = push_cmda_records(assigned_df, crm, report)
+        return (cmda_stats, *create_leads_records(assigned_df, crm, report))
+    crm.ensure_valid_token()
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="zoho-push") as pool:
+        cmda_future = pool.submit(push_cmda_records, assigned_df, crm, report)
+        leads_future = pool.submit(create_leads_records, assigned_df, crm, report)
+        cmda_stats = cmda_future.result()
+        leads_stats, leads_success = leads_future.result()
+    return cmda_stats, leads_stats, leads_success
 
+def import_response(cmda_stats, leads_stats, leads_success):
+    if not cmda_stats["total"]:
+        return {
+            "message": "No records found in Excel file",
+            "statusCode": 400,
+            "status": False,
+        }
+    counts = {"cmda": cmda_stats, "leads": leads_stats}
+    cmda_success = cmda_stats["successful"] > 0 or cmda_stats["failed"] == 0
+    if cmda_success and leads_success:
+        return {
+            "message": "Records pushed to CMDA and Leads created successfully!",
+            "statusCode": 200,
+            "status": True,
+            "data": [counts],
+        }
+    else:
+        error_msg = []
+        if not cmda_success:
+            error_msg.append("Failed to push some CMDA records")
+        if not leads_success:
+            error_msg.append("Failed to create some Leads")
+
+        return {
+            "message": "; ".join(error_msg),
+            "statusCode": 400,
+            "status": False,
+            "data": [counts],
+        }
+
+def run_summary(totals, cmda_stats, leads_stats, error=None):
+    # cmda_stats/leads_stats are None when the push raised before returning them.
+    summary = {
+        "Read": {"rows": totals["rows"]},
+        "Filter": {"matched": totals["matched"], "unmatched": totals["unmatched"]},
+        "Assign": {"assigned": totals["assigned"], "unassigned": totals["unassigned"]},
+        "CMDA push": cmda_stats or {"status": "not completed"},
+        "Leads": leads_stats or {"status": "not completed"},
+    }
+    if error is not None:
+        summary["Error"] = {"message": str(error)}
+    return summary
+
+def lead_import_dataframe(df, crm, original_file_name="input_file.xlsx", send_email=True, progress=None):
+    report = _reporter(progress)
+    digest = send_email and digest_reports_enabled()
+    report("filter", status="running", rows=len(df))
+    matched_df, unmatched_df = filter_development_records(df)
+    if send_email and not digest:
+        send_filter_report(matched_df, unmatched_df, original_file_name)
+    report("filter", status="done", matched=len(matched_df), unmatched=len(unmatched_df))
+    report("assign", status="running")
+    fuzzy_match_threshold = area_fuzzy_match_threshold()
+    assigned_df, unassigned_df = split_by_assignment(matched_df, "Area Name", "Sales Person", fuzzy_match_threshold)
+    if send_email and not digest:
+        send_assignment_report(unassigned_df, original_file_name)
+    report("assign", status="done", assigned=len(assigned_df), unassigned=len(unassigned_df))
+    # The digest goes out even if the push raises, so the filter and assignment reports are never lost.
+    cmda_stats = leads_stats = error = None
+    try:
+        cmda_stats, leads_stats, leads_success = push_assigned_records(assigned_df, crm, report)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if digest:
+            totals = {"rows": len(df), "matched": len(matched_df), "unmatched": len(unmatched_df), "assigned": len(assigned_df), "unassigned": len(unassigned_df)}
+            send_run_digest(original_file_name, {"Matched Records": matched_df, "Filtered Out": unmatched_df, "Unmatched Areas": unassigned_df}, run_summary(totals, cmda_stats, leads_stats, error))
+    return import_response(cmda_stats, leads_stats, leads_success)
+
+def lead_import_stream(source, crm, original_file_name="input_file.xlsx", chunk_size=5000, send_email=True, progress=None):
+    # Bounded-memory mode: each chunk goes through filter -> assign -> push before the next is read.
+    # Rows for the email reports are spilled to disk chunk by chunk (ReportSpool), not kept in memory.
+    report = _reporter(progress)
+    fuzzy_match_threshold = area_fuzzy_match_threshold()
+    totals = {"rows": 0, "matched": 0, "unmatched": 0, "assigned": 0, "unassigned": 0}
+    cmda_stats, leads_stats, leads_success = _empty_stats(), _empty_stats(), True
+    spool = ReportSpool() if send_email else None
+    # Reports for the chunks already processed are sent even if a later chunk raises.
+    error = None
+    started = time.perf_counter()
+    try:
+        for chunk_number, chunk in enumerate(iter_workbook_chunks(source, chunk_size), start=1):
+            matched_df, unmatched_df = filter_development_records(chunk)
+            assigned_df, unassigned_df = split_by_assignment(matched_df, "Area Name", "Sales Person", fuzzy_match_threshold)
+            totals["rows"] += len(chunk)
+            totals["matched"] += len(matched_df)
+            totals["unmatched"] += len(unmatched_df)
+            totals["assigned"] += len(assigned_df)
+            totals["unassigned"] += len(unassigned_df)
+            if send_email:
+                spool.add("Filtered Out", unmatched_df)
+                spool.add("Unmatched Areas", unassigned_df)
+            chunk_cmda, chunk_leads, chunk_leads_success = push_assigned_records(assigned_df, crm, report)
+            _add_stats(cmda_stats, chunk_cmda)
+            _add_stats(leads_stats, chunk_leads)
+            leads_success = leads_success and chunk_leads_success
+            report("stream", status="running", chunks=chunk_number, **totals)
+            del chunk, matched_df, unmatched_df, assigned_df, unassigned_df
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        # Both pushes run chunk by chunk for the whole stream, so each took the stream's wall time.
+        cmda_stats["seconds"] = leads_stats["seconds"] = round(time.perf_counter() - started, 2)
+        if send_email:
+            try:
+                filtered_out, unassigned = spool.sheet("Filtered Out"), spool.sheet("Unmatched Areas")
+                if digest_reports_enabled():
+                    send_run_digest(original_file_name, {"Filtered Out": filtered_out, "Unmatched Areas": unassigned}, run_summary(totals, cmda_stats, leads_stats, error))
+                else:
+                    send_filter_report(pd.DataFrame(), filtered_out, original_file_name, matched_count=totals["matched"])
+                    send_assignment_report(unassigned, original_file_name)
+            finally:
+                spool.close()
+    report("stream", status="done", seconds=cmda_stats["seconds"], **totals)
+    return import_response(cmda_stats, leads_stats, leads_success)
 
+if __name__ == "__main__":
+    import json
+    import sys
+    from mail_outbox import flush_outbox
+    if len(sys.argv) != 2:
+        sys.exit("usage: python Integration.py <workbook.xlsx>")
+    result = lead_import(sys.argv[1])
+    flush_outbox()
+    print(json.dumps(result, indent=2, default=str))
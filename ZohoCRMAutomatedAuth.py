@@ -1,22 +1,171 @@
-import requests
+import http_client
+from token_manager import get_token_manager
+from owner_resolver import get_owner_resolver, is_owner_error
+from import_ledger import get_import_ledger, source_hashes, UNCHANGED, CHANGED
 import json
 import time
 import os
+import threading
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, parse_qs
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, WebDriverException, ElementNotInteractableException
-from selenium.webdriver.common.action_chains import ActionChains
 import pandas as pd
 import re
 import traceback
 from dotenv import load_dotenv
 load_dotenv()
 
+# /settings/modules metadata is shared across requests and re-fetched after
+# MODULE_CACHE_TTL_SECONDS or when the module endpoint returns 404.
+_module_cache = {"api_names": None, "fetched_at": 0.0}
+_module_cache_lock = threading.Lock()
+
+def invalidate_module_cache():
+    with _module_cache_lock:
+        _module_cache["api_names"] = None
+        _module_cache["fetched_at"] = 0.0
+
+CMDA_FIELD_MAPPING = {
+    "Sales Person": "Lead_Owner", 
+    "Email ID": "Email",
+    "Mobile No.": "Mobile_Number",
+    "Date of permit": "Date_of_Permit",
+    "Applicant Name": "Lead_Name",
+    "Nature of Development": "Nature_of_Developments",
+    "Dwelling Unit Info": "Dwelling_Unit_Info",
+    "Reference": "Reference",
+    "Company_Name": "Company_Name",
+    "Architect Name": "Architect",
+    "Planning Permission No.": "Plan_Permission",
+    "Applicant Address": "Applicant_Address",
+    "Future_Projects": "Future_Project", 
+    "Creation_Time": "Creation_Time",
+    "Which_Brand_Looking_for": "Which_Brand_Looking_for",
+    "How_Much_Square_Feet": "How_Much_Square_Feet",
+    "Area Name": "Area_Name",  
+    "Site Address": "Site_Address"
+}
+
+# Column-wise helpers for the batch formatters. Each one reproduces, for a whole
+# Series, what the per-record code does to a single value, so both paths emit
+# identical payloads.
+
+_DROPPED = object()
+
+def _column(df, name, default=None):
+    # A missing column behaves like record.get(name, default) on every row.
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+def _as_text(series):
+    # str(value) for every element. Datetime columns need care: astype(str) drops the
+    # midnight time that str(Timestamp) keeps.
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, "tz", None) is None and not (series.dt.microsecond.any() or series.dt.nanosecond.any()):
+            return series.dt.strftime("%Y-%m-%d %H:%M:%S")
+        return series.astype(object).map(str)
+    text = series.astype(str)
+    # Newer pandas keeps missing values missing in astype(str); str() would give "nan"/"None".
+    missing = text.isna()
+    if missing.any():
+        text = text.astype(object)
+        text[missing] = series[missing].astype(object).map(str)
+    return text
+
+def _is_str(series):
+    if series.dtype != object and pd.api.types.is_string_dtype(series):
+        return series.notna()
+    return series.map(type) == str
+
+def _truthy(series):
+    present = series.notna()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return present
+    return present & series.where(present, False).astype(bool)
+
+def _first_number(text):
+    return text.str.extract(r'(\d+)', expand=False)
+
+def _first_int(text, scale=1):
+    # int(first run of digits) * scale as Python ints, 0 where there is no number.
+    digits = _first_number(text)
+    values = pd.Series(0, index=text.index, dtype=object)
+    fits_int64 = digits.notna() & (digits.str.len() <= 15)
+    values[fits_int64] = (digits[fits_int64].astype("int64") * scale).astype(object)
+    too_long = digits.notna() & ~fits_int64
+    if too_long.any():
+        values[too_long] = digits[too_long].map(lambda number: int(number) * scale)
+    return values
+
+def _present_cells(series, raw=False):
+    # final_data_cleaning for a whole column: None, NaN/NaT and blank strings are dropped.
+    # Columns built here are already stripped, so only raw input columns need the full check.
+    series = series.astype(object)
+    blank = series.isna()
+    if raw:
+        is_str = _is_str(series)
+        if is_str.any():
+            blank |= is_str & (series.where(is_str, "").astype(str).str.strip() == "")
+    else:
+        blank |= series == ""
+    return series.where(~blank, _DROPPED)
+
+def _clean_text(series):
+    text = _as_text(series).str.strip()
+    return text.where(series.notna() & ~text.str.lower().isin(['', 'nan', 'none', 'null']), "")
+
+def _format_timestamp_value(value):
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%dT%H:%M:%S+05:30")
+        except ValueError:
+            try:
+                return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                return str(value)
+    elif hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%dT%H:%M:%S+05:30")
+    return str(value)
+
+def _day_first_date(value, date_format):
+    try:
+        return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+    except ValueError:
+        return str(value).strip()
+
+def _format_day_first_dates(values, date_format, candidates):
+    # handle_date_fields for a column: candidates are parsed with date_format, everything else
+    # present is passed through cleaned, and rows without a usable value come back missing.
+    clean = _clean_text(values)
+    present = _truthy(values) & (clean != "")
+    result = clean.astype(object).where(present, None)
+    candidates = candidates & present
+    if candidates.any():
+        parsed = pd.to_datetime(values[candidates], format=date_format, errors="coerce")
+        result[parsed.index[parsed.notna()]] = parsed.dropna().dt.strftime("%Y-%m-%d")
+        unparsed = parsed.index[parsed.isna()]
+        if len(unparsed):
+            result[unparsed] = values[unparsed].map(lambda value: _day_first_date(value, date_format))
+    return result
+
+def _format_timestamps(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime("%Y-%m-%dT%H:%M:%S+05:30")
+    result = pd.Series("", index=values.index, dtype=object)
+    is_text = values.map(lambda value: isinstance(value, str))
+    text = values[is_text]
+    full = pd.to_datetime(text, format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    result[full.index[full.notna()]] = full.dropna().dt.strftime("%Y-%m-%dT%H:%M:%S+05:30")
+    rest = text[full.isna()]
+    day = pd.to_datetime(rest, format="%Y-%m-%d", errors="coerce")
+    result[day.index[day.notna()]] = day.dropna().dt.strftime("%Y-%m-%d")
+    # Anything pandas could not parse (or non-string values) goes through the scalar path.
+    leftover = ~is_text
+    leftover[day.index[day.isna()]] = True
+    if leftover.any():
+        result[leftover] = values[leftover].map(_format_timestamp_value)
+    return result
+
 class ZohoCRMAutomatedAuth:
 
     def __init__(self):
@@ -30,12 +179,57 @@ class ZohoCRMAutomatedAuth:
         self.token_url = os.getenv("TOKEN_URL")
         self.api_base_url = os.getenv("API_BASE_URL")
         self.zoho_model_name = os.getenv("ZOHO_MODEL_NAME")
-        self.access_token = None
-        self.refresh_token = None
-        self.token_expires_at = None
         self.token_file = os.getenv("TOKEN_FILE_NAME")
+        self.tokens = get_token_manager(self.token_file)
+        self.last_push_stats = None
+        self.last_oauth_timings = {}
+        self.upsert = os.getenv("ZOHO_UPSERT", "false").strip().lower() in ("1", "true", "yes")
+        self.duplicate_check_fields = self.parse_fields(os.getenv("ZOHO_DUPLICATE_CHECK_FIELDS", "Plan_Permission"))
+        self.leads_duplicate_check_fields = self.parse_fields(os.getenv("ZOHO_LEADS_DUPLICATE_CHECK_FIELDS", "Planning_Permission_No"))
+
+    @staticmethod
+    def parse_fields(value):
+        return [field.strip() for field in (value or "").split(",") if field.strip()]
+
+    def write_request(self, module, records, trigger, upsert, duplicate_check_fields):
+        # Insert posts to /{module}; upsert posts to /{module}/upsert so Zoho matches existing
+        # records on duplicate_check_fields and updates them in the same call.
+        url = f"{self.api_base_url}/{module}/upsert" if upsert else f"{self.api_base_url}/{module}"
+        payload = {'data': records, 'trigger': trigger}
+        if upsert and duplicate_check_fields:
+            payload['duplicate_check_fields'] = duplicate_check_fields
+        return url, payload
+
+    @property
+    def access_token(self):
+        return self.tokens.access_token
+
+    @access_token.setter
+    def access_token(self, value):
+        self.tokens.access_token = value
+
+    @property
+    def refresh_token(self):
+        return self.tokens.refresh_token
+
+    @refresh_token.setter
+    def refresh_token(self, value):
+        self.tokens.refresh_token = value
+
+    @property
+    def token_expires_at(self):
+        return self.tokens.token_expires_at
+
+    @token_expires_at.setter
+    def token_expires_at(self, value):
+        self.tokens.token_expires_at = value
     
+    # Selenium is only needed for the browser OAuth fallback, so it is imported
+    # inside the methods that drive the browser rather than at module load.
     def setup_driver(self, headless=False):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.common.exceptions import WebDriverException
         chrome_options = Options()
         if headless:
             chrome_options.add_argument("--headless=new")        
@@ -56,30 +250,50 @@ class ZohoCRMAutomatedAuth:
         try:
             driver = webdriver.Chrome(options=chrome_options)
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            driver.implicitly_wait(10)
             return driver
         except WebDriverException as e:
             return None
         
-    def wait_and_find_element(self, driver, selectors, timeout=30):
-        wait = WebDriverWait(driver, timeout)
-        for selector_type, selector_value in selectors:
-            try:
-                if selector_type == "id":
-                    element = wait.until(EC.element_to_be_clickable((By.ID, selector_value)))
-                elif selector_type == "name":
-                    element = wait.until(EC.element_to_be_clickable((By.NAME, selector_value)))
-                elif selector_type == "xpath":
-                    element = wait.until(EC.element_to_be_clickable((By.XPATH, selector_value)))
-                elif selector_type == "css":
-                    element = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector_value)))
-                if element.is_displayed() and element.is_enabled():
+    def clickable_condition(self, selectors):
+        # One wait condition over every selector: returns the first clickable match as
+        # (element, selector_type, selector_value), or False so WebDriverWait keeps polling.
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import WebDriverException
+        by = {"id": By.ID, "name": By.NAME, "xpath": By.XPATH, "css": By.CSS_SELECTOR}
+        conditions = [(selector_type, selector_value, EC.element_to_be_clickable((by[selector_type], selector_value))) for selector_type, selector_value in selectors]
+        def first_clickable(driver):
+            for selector_type, selector_value, condition in conditions:
+                try:
+                    element = condition(driver)
+                except WebDriverException:
+                    continue
+                if element:
                     return element, selector_type, selector_value
-            except (TimeoutException, ElementNotInteractableException):
-                continue
-        return None, None, None
+            return False
+        return first_clickable
+
+    def wait_and_find_element(self, driver, selectors, timeout=30):
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.2).until(self.clickable_condition(selectors))
+        except TimeoutException:
+            return None, None, None
+
+    def wait_for_url_change(self, driver, url, timeout=15):
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.2).until(EC.url_changes(url))
+            return True
+        except TimeoutException:
+            return False
     
     def safe_click(self, driver, element, description="element"):
+        from selenium.common.exceptions import ElementNotInteractableException
+        from selenium.webdriver.common.action_chains import ActionChains
         try:
             element.click()
             return True
@@ -97,7 +311,6 @@ class ZohoCRMAutomatedAuth:
     def safe_send_keys(self, driver, element, text, description="field"):
         try:
             element.clear()
-            time.sleep(0.5)
             element.send_keys(text)
             return True
         except Exception as e:
@@ -115,7 +328,7 @@ class ZohoCRMAutomatedAuth:
             element, _, _ = self.wait_and_find_element(driver, continue_selectors, 20)
             if element:
                 if self.safe_click(driver, element, "continue/skip button"):
-                    time.sleep(3)
+                    self.wait_for_url_change(driver, current_url)
                     return True
             else:
                 parsed_url = urlparse(current_url)
@@ -125,7 +338,6 @@ class ZohoCRMAutomatedAuth:
                     from urllib.parse import unquote
                     decoded_service_url = unquote(service_url)
                     driver.get(decoded_service_url)
-                    time.sleep(10)
                     return True
         return False
     
@@ -135,13 +347,26 @@ class ZohoCRMAutomatedAuth:
         return auth_url
     
     def automate_oauth_flow(self, headless=False):
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        # Every step waits on a page condition instead of a fixed sleep; how long each
+        # one took is kept in last_oauth_timings and printed when the flow ends.
+        self.last_oauth_timings = {}
+        flow_started = step_started = time.perf_counter()
+        def mark(step):
+            nonlocal step_started
+            now = time.perf_counter()
+            self.last_oauth_timings[step] = round(now - step_started, 3)
+            step_started = now
         driver = self.setup_driver(headless)
         if not driver:
             return False
+        mark("start_browser")
         try:
             auth_url = self.get_authorization_url()
             driver.get(auth_url)
-            time.sleep(3)
+            mark("load_login_page")
             email_selectors = [("id", "login_id"),("name", "LOGIN_ID"),("xpath", "//input[@type='email']"),("xpath", "//input[@placeholder='Email ID']"),("css", "input[type='email']"),("xpath", "//input[contains(@class, 'email')]")]
             email_element, _, _ = self.wait_and_find_element(driver, email_selectors, 30)
             if not email_element:
@@ -152,8 +377,8 @@ class ZohoCRMAutomatedAuth:
             next_selectors = [("id", "nextbtn"),("id", "signin_submit"),("xpath", "//button[contains(text(), 'Next')]"),("xpath", "//button[contains(text(), 'Continue')]"),("xpath", "//input[@value='Next']"),("xpath", "//input[@value='Continue']"),("css", "button[type='submit']"),("xpath", "//button[@type='submit']")]
             next_element, _, _ = self.wait_and_find_element(driver, next_selectors, 20)
             if next_element:
-                if self.safe_click(driver, next_element, "next button"):
-                    time.sleep(3)           
+                self.safe_click(driver, next_element, "next button")
+            mark("enter_email")
             password_selectors = [("id", "password"),("name", "PASSWORD"),("xpath", "//input[@type='password']"),("css", "input[type='password']"),("xpath", "//input[contains(@class, 'password')]")]
             password_element, _, _ = self.wait_and_find_element(driver, password_selectors, 30)
             if not password_element:
@@ -168,31 +393,46 @@ class ZohoCRMAutomatedAuth:
                 return False
             if not self.safe_click(driver, signin_element, "sign in button"):
                 return False
-            time.sleep(5)            
-            if self.handle_tfa_banner_page(driver):
-                time.sleep(3)            
+            mark("enter_password")
+            # After sign-in Zoho may show a 2FA banner, the consent page, or redirect straight
+            # back with the code. One wait watches for all three and reacts to whichever appears.
             accept_selectors = [("xpath", "//button[contains(text(), 'Accept')]"),("xpath", "//button[contains(text(), 'Allow')]"),("xpath", "//button[contains(text(), 'Authorize')]"),("xpath", "//input[@value='Accept']"),("xpath", "//input[@value='Allow']"),("id", "accept"),("id", "allow"),("css", "button.accept"),("css", "button.allow"),("xpath", "//button[contains(@class, 'accept')]"),("xpath", "//button[contains(@class, 'allow')]")]
-            accept_element, _, _ = self.wait_and_find_element(driver, accept_selectors, 15)
-            if accept_element:
-                if self.safe_click(driver, accept_element, "accept button"):
-                    time.sleep(3)
-            else:
-                pass
-            max_wait_time = 60
-            start_time = time.time()
-            while time.time() - start_time < max_wait_time:
-                current_url = driver.current_url
-                if "google.com" in current_url and "code=" in current_url:
+            accept_clickable = self.clickable_condition(accept_selectors)
+            redirected = EC.url_contains("code=")
+            def next_state(d):
+                if redirected(d) and "google.com" in d.current_url:
+                    return "redirected", None
+                if "tfa-banner" in d.current_url or "announcement" in d.current_url:
+                    return "banner", None
+                found = accept_clickable(d)
+                return ("accept", found[0]) if found else False
+            deadline = time.monotonic() + 60
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    state, element = WebDriverWait(driver, remaining, poll_frequency=0.2).until(next_state)
+                except TimeoutException:
+                    break
+                if state == "redirected":
                     break
-                if "tfa-banner" in current_url or "announcement" in current_url:
+                if state == "banner":
                     self.handle_tfa_banner_page(driver)
-                time.sleep(2)
+                    mark("tfa_banner")
+                else:
+                    url = driver.current_url
+                    if self.safe_click(driver, element, "accept button"):
+                        self.wait_for_url_change(driver, url)
+                    mark("consent")
             current_url = driver.current_url
+            mark("redirect")
             if "google.com" in current_url and "code=" in current_url:
                 parsed_url = urlparse(current_url)
                 code = parse_qs(parsed_url.query).get('code', [None])[0]                
                 if code:
                     success = self.get_access_token(code)
+                    mark("exchange_code")
                     return success
                 else:
                     return False
@@ -204,8 +444,11 @@ class ZohoCRMAutomatedAuth:
             return False
         finally:
             driver.quit()
+            self.last_oauth_timings["total"] = round(time.perf_counter() - flow_started, 3)
+            print("⏱️ OAuth flow timings (s): " + ", ".join(f"{step}={seconds}" for step, seconds in self.last_oauth_timings.items()))
     
     def debug_page(self, driver):
+        from selenium.webdriver.common.by import By
         try:
             elements_info = []
             for tag in ['input', 'button', 'a']:
@@ -222,7 +465,7 @@ class ZohoCRMAutomatedAuth:
     def get_access_token(self, authorization_code):        
         data = {'grant_type': 'authorization_code','client_id': self.client_id,'client_secret': self.client_secret,'redirect_uri': self.redirect_uri,'code': authorization_code}
         try:
-            response = requests.post(self.token_url, data=data)
+            response = http_client.post(self.token_url, data=data)
             if response.status_code == 200:
                 token_data = response.json()
                 self.access_token = token_data['access_token']
@@ -241,7 +484,7 @@ class ZohoCRMAutomatedAuth:
             return False
         data = {'grant_type': 'refresh_token','client_id': self.client_id,'client_secret': self.client_secret,'refresh_token': self.refresh_token}
         try:
-            response = requests.post(self.token_url, data=data)
+            response = http_client.post(self.token_url, data=data)
             if response.status_code == 200:
                 token_data = response.json()
                 self.access_token = token_data['access_token']
@@ -278,38 +521,26 @@ class ZohoCRMAutomatedAuth:
         return False
     
     def ensure_valid_token(self):
-        if not self.access_token:
-            self.load_tokens()  
-        if self.token_expires_at and datetime.now() >= self.token_expires_at:
-            if not self.refresh_access_token():
-                return self.automate_oauth_flow()
-            return True        
-        if not self.access_token:
-            return self.automate_oauth_flow()
-        return True
+        return self.tokens.ensure_valid_token(self)
+
+    def api_request(self, method, url, headers=None, **kwargs):
+        # Every Zoho API call goes through here with the current access token. A 401 means Zoho
+        # no longer accepts the token (revoked, or expired before its expires_at): it is
+        # invalidated, refreshed once for all callers, and the call is repeated one time.
+        # A rejected call was not processed, so repeating an insert cannot duplicate it.
+        access_token = self.access_token
+        response = http_client.request(method, url, headers={**(headers or {}), 'Authorization': f'Zoho-oauthtoken {access_token}'}, **kwargs)
+        if response.status_code != 401:
+            return response
+        print("🔑 Zoho rejected the access token, refreshing it and retrying once...")
+        self.tokens.invalidate(access_token)
+        if not self.ensure_valid_token():
+            return response
+        return http_client.request(method, url, headers={**(headers or {}), 'Authorization': f'Zoho-oauthtoken {self.access_token}'}, **kwargs)
 
     def format_record_for_zoho(self, record):
         formatted_record = {}
-        field_mapping = {
-            "Sales Person": "Lead_Owner", 
-            "Email ID": "Email",
-            "Mobile No.": "Mobile_Number",
-            "Date of permit": "Date_of_Permit",
-            "Applicant Name": "Lead_Name",
-            "Nature of Development": "Nature_of_Developments",
-            "Dwelling Unit Info": "Dwelling_Unit_Info",
-            "Reference": "Reference",
-            "Company_Name": "Company_Name",
-            "Architect Name": "Architect",
-            "Planning Permission No.": "Plan_Permission",
-            "Applicant Address": "Applicant_Address",
-            "Future_Projects": "Future_Project", 
-            "Creation_Time": "Creation_Time",
-            "Which_Brand_Looking_for": "Which_Brand_Looking_for",
-            "How_Much_Square_Feet": "How_Much_Square_Feet",
-            "Area Name": "Area_Name",  
-            "Site Address": "Site_Address"
-        }                
+        field_mapping = CMDA_FIELD_MAPPING
         try:
             dwelling_units = record.get("Dwelling Unit Info")
             if dwelling_units is not None and not pd.isna(dwelling_units):
@@ -338,20 +569,7 @@ class ZohoCRMAutomatedAuth:
                 continue
             value = record[excel_field]
             if excel_field in ["Creation_Time", "Date_of_Permit"]:
-                if isinstance(value, str):
-                    try:
-                        dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
-                        formatted_record[zoho_field] = dt.strftime("%Y-%m-%dT%H:%M:%S+05:30")
-                    except ValueError:
-                        try:
-                            dt = datetime.strptime(value, "%Y-%m-%d")
-                            formatted_record[zoho_field] = dt.strftime("%Y-%m-%d")
-                        except ValueError:
-                            formatted_record[zoho_field] = str(value)
-                elif hasattr(value, "strftime"):
-                    formatted_record[zoho_field] = value.strftime("%Y-%m-%dT%H:%M:%S+05:30")
-                else:
-                    formatted_record[zoho_field] = str(value)            
+                formatted_record[zoho_field] = _format_timestamp_value(value)
             elif excel_field in ["Dwelling Unit Info", "How_Much_Square_Feet"]:
                 try:
                     numbers = re.findall(r'\d+', str(value))
@@ -396,87 +614,184 @@ class ZohoCRMAutomatedAuth:
         formatted_record['Lead_Source'] = "Digital Leads"
         return formatted_record
 
-    def push_records_to_zoho(self, records, batch_size=100):
+    def format_records_for_zoho(self, df):
+        # Batch version of format_record_for_zoho: the same transformations applied a column
+        # at a time, with the payload dicts built only at the end.
+        df = df.reset_index(drop=True)
+        index = df.index
+        formatted = {}
+        dwelling = _column(df, "Dwelling Unit Info")
+        dwelling_text = _as_text(dwelling).str.strip()
+        has_dwelling = dwelling.notna() & (dwelling_text != "") & (dwelling_text.str.lower() != "nan")
+        formatted["No_of_bathrooms"] = _first_int(dwelling_text.where(has_dwelling, ""), 2).map(str)
+        for excel_field, zoho_field in CMDA_FIELD_MAPPING.items():
+            values = _column(df, excel_field)
+            if excel_field in ["Creation_Time", "Date_of_Permit"]:
+                column = _format_timestamps(values)
+            elif excel_field in ["Dwelling Unit Info", "How_Much_Square_Feet"]:
+                column = _first_number(_as_text(values)).fillna("0")
+            elif excel_field == "Email ID":
+                email = _as_text(values).str.strip()
+                column = email.where(email.str.contains("@", regex=False) & email.str.contains(".", regex=False), "")
+            elif excel_field == "Mobile No.":
+                column = _as_text(values).str.replace(r'[^\d+]', '', regex=True)
+            else:
+                column = _as_text(values).str.strip()
+            formatted[zoho_field] = column.where(values.notna(), "").astype(object)
+        applicant = _column(df, "Applicant Name")
+        company = _column(df, "Company_Name")
+        names = pd.Series(f"Record_{datetime.now().strftime('%Y%m%d%H%M%S')}", index=index, dtype=object)
+        use_company = _truthy(company) & ~_truthy(applicant)
+        use_applicant = _truthy(applicant)
+        names[use_company] = _as_text(company[use_company]).str.strip()
+        names[use_applicant] = _as_text(applicant[use_applicant]).str.strip()
+        formatted["Name"] = names
+        sales_person = _column(df, "Sales Person")
+        has_sales_person = _truthy(sales_person)
+        if has_sales_person.any():
+            sales_names = _as_text(sales_person[has_sales_person]).str.strip()
+            user_ids = {name: user_id for name, user_id in self.get_user_ids_by_name(sales_names.unique()).items() if user_id}
+            resolved = sales_names.map(user_ids).dropna()
+            formatted["Lead_Owner"][resolved.index] = resolved
+        formatted['Lead_Source'] = pd.Series("Digital Leads", index=index, dtype=object)
+        keys = list(formatted)
+        return [dict(zip(keys, row)) for row in zip(*(column.tolist() for column in formatted.values()))]
+
+    def filter_with_ledger(self, target, pending, push_changed=False):
+        # pending: list of (planning_no, content_hash, payload). Returns the entries that still need pushing.
+        # Changed rows are only pushed when the write is an upsert; an insert would duplicate them.
+        ledger = get_import_ledger()
+        if not ledger or not pending:
+            return pending, 0, []
+        statuses = ledger.classify(target, [(planning_no, payload_hash) for planning_no, payload_hash, _ in pending])
+        to_push, skipped, changed = [], 0, []
+        for entry, status in zip(pending, statuses):
+            if status == UNCHANGED:
+                skipped += 1
+            elif status == CHANGED and not push_changed:
+                changed.append(entry)
+            else:
+                to_push.append(entry)
+        if skipped or changed:
+            print(f"📒 Ledger ({target}): {skipped} unchanged skipped, {len(changed)} changed flagged, {len(to_push)} new")
+        for planning_no, _, _ in changed:
+            print(f"⚠️ Changed since last import, not pushed: {planning_no}")
+        return to_push, skipped, changed
+
+    def push_records_to_zoho(self, records, batch_size=100, upsert=None):
+        # last_push_stats only ever describes this call; None means nothing was pushed.
+        self.last_push_stats = None
         if not self.ensure_valid_token():
             return False
-        if not records:
+        if records is None or len(records) == 0:
+            self.last_push_stats = {"total": 0, "successful": 0, "failed": 0, "skipped": 0, "changed": 0}
             return True 
-        total_records = len(records)
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records, dtype=object)
+        total_records = len(df)
         successful_records = 0
         failed_records = 0        
-        for i in range(0, total_records, batch_size):
-            batch = records[i:i + batch_size]
-            formatted_batch = []
-            for record in batch:
-                formatted_record = self.format_record_for_zoho(record)
-                if formatted_record:
-                    formatted_batch.append(formatted_record)
-            if not formatted_batch:
-                continue            
-            url = f"{self.api_base_url}/{self.zoho_model_name}"
-            headers = {'Authorization': f'Zoho-oauthtoken {self.access_token}','Content-Type': 'application/json'}
-            payload = {'data': formatted_batch,'trigger': ['approval', 'workflow', 'blueprint']}
+        planning_nos = _clean_text(_column(df, "Planning Permission No.")).tolist()
+        # Classify on the source hashes first so rows the ledger skips are never formatted.
+        pending = list(zip(planning_nos, source_hashes(df), range(total_records)))
+        upsert = self.upsert if upsert is None else upsert
+        pending, skipped_records, changed = self.filter_with_ledger(self.zoho_model_name, pending, push_changed=upsert)
+        rows = [row for _, _, row in pending]
+        if len(rows) < total_records:
+            df = df.iloc[rows]
+        formatted_records = self.format_records_for_zoho(df) if rows else []
+        pending = [(planning_no, payload_hash, formatted_record) for (planning_no, payload_hash, _), formatted_record in zip(pending, formatted_records)]
+        ledger = get_import_ledger()
+        owner_errors = 0
+        success_codes = (200, 201, 202) if upsert else (201,)
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            formatted_batch = [formatted_record for _, _, formatted_record in batch]
+            url, payload = self.write_request(self.zoho_model_name, formatted_batch, ['approval', 'workflow', 'blueprint'], upsert, self.duplicate_check_fields)
+            headers = {'Content-Type': 'application/json'}
             try:
-                response = requests.post(url, json=payload, headers=headers)
-                if response.status_code == 201:
-                    response_data = response.json()
+                response = self.api_request("POST", url, json=payload, headers=headers)
+                response_data = {}
+                if response.status_code == 400:
+                    # Zoho answers 400 when every record of the batch failed; the per-record reasons are still in data.
+                    try:
+                        response_data = response.json()
+                    except ValueError:
+                        response_data = {}
+                if response.status_code in success_codes or response_data.get('data'):
+                    response_data = response_data or response.json()
                     batch_success = 0
                     batch_failed = 0
+                    pushed = []
                     if 'data' in response_data:
-                        for result in response_data['data']:
+                        for (planning_no, payload_hash, _), result in zip(batch, response_data['data']):
                             if result.get('status') == 'success':
                                 batch_success += 1
-                                print(f"✅ Record created successfully: {result.get('message', 'Success')}")
+                                pushed.append((planning_no, payload_hash, result.get('details', {}).get('id')))
+                                print(f"✅ Record {'upserted' if upsert else 'created'} successfully: {result.get('action', '')} {result.get('message', 'Success')}")
                             else:
                                 batch_failed += 1
+                                owner_errors += is_owner_error(result)
                                 print(f"❌ Record failed: {result.get('message', 'Unknown error')}")
                                 print(f"   Details: {result.get('details', 'No details')}")
+                    if ledger:
+                        ledger.record_results(self.zoho_model_name, pushed)
                     successful_records += batch_success
                     failed_records += batch_failed
                 else:
                     print(f"❌ HTTP Error {response.status_code}: {response.text}")
+                    if response.status_code == 404:
+                        invalidate_module_cache()
                     failed_records += len(formatted_batch)
-                if i + batch_size < total_records:
-                    time.sleep(1)  
             except Exception as e:
                 traceback.print_exc()
                 failed_records += len(formatted_batch)        
-        print(f"\n✅ Push completed: {successful_records} successful, {failed_records} failed out of {total_records} total")
-        return successful_records > 0
+        self.forget_owners_after_rejection(owner_errors)
+        print(f"\n✅ Push completed: {successful_records} successful, {failed_records} failed, {skipped_records} unchanged, {len(changed)} changed out of {total_records} total")
+        self.last_push_stats = {"total": total_records, "successful": successful_records, "failed": failed_records, "skipped": skipped_records, "changed": len(changed)}
+        return successful_records > 0 or failed_records == 0
+
+    def get_module_names(self, force_refresh=False):
+        ttl = float(os.getenv("MODULE_CACHE_TTL_SECONDS", "3600"))
+        with _module_cache_lock:
+            if not force_refresh and _module_cache["api_names"] is not None and time.monotonic() - _module_cache["fetched_at"] < ttl:
+                return _module_cache["api_names"]
+        url = f"{self.api_base_url}/settings/modules"
+        headers = {'Content-Type': 'application/json'}
+        response = self.api_request("GET", url, headers=headers)
+        if response.status_code != 200:
+            return None
+        modules = response.json()
+        module_names = frozenset(module['api_name'] for module in modules.get('modules', []))
+        with _module_cache_lock:
+            _module_cache["api_names"] = module_names
+            _module_cache["fetched_at"] = time.monotonic()
+        return module_names
 
     def test_api_connection(self):
         if not self.ensure_valid_token():
             return False
-        url = f"{self.api_base_url}/settings/modules"
-        headers = {'Authorization': f'Zoho-oauthtoken {self.access_token}','Content-Type': 'application/json'}
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                modules = response.json()
-                module_names = [module['api_name'] for module in modules.get('modules', [])]
-                if self.zoho_model_name in module_names:
-                    return True
-                else:
-                    return False
-            else:
-                return False
+            module_names = self.get_module_names()
+            if module_names is not None and self.zoho_model_name in module_names:
+                return True
+            # A cached list may predate the module being created, so check once more against Zoho.
+            module_names = self.get_module_names(force_refresh=True)
+            return module_names is not None and self.zoho_model_name in module_names
         except Exception as e:
             return False
 
+    def forget_owners_after_rejection(self, owner_errors):
+        # Zoho rejects records owned by a deactivated user; reload the users on the next lookup
+        # instead of assigning the same stale ID until the owner cache expires.
+        if owner_errors:
+            print(f"👥 {owner_errors} record(s) rejected for their owner, reloading Zoho users on the next lookup")
+            get_owner_resolver().invalidate()
+
     def get_user_id_by_name(self, sales_person_name):
-        if not self.ensure_valid_token():
-            return None        
-        user_id_mapping = {
-            "Abhishek R G": os.getenv("ZOHO_USER_ID_ABHISHEK"), 
-            "Karthik": os.getenv("ZOHO_USER_ID_KARTHIK"),  
-            "Jagan": os.getenv("ZOHO_USER_ID_JAGAN"),    
-            "Dinakaran": os.getenv("ZOHO_USER_ID_DINAKARAN"),
-            "Venkatesh": os.getenv("ZOHO_USER_ID_VENKATESH"),
-            "Ameen Syed": os.getenv("ZOHO_USER_ID_AMEEN"),
-            "Balachander": os.getenv("ZOHO_USER_ID_BALACHANDER"),
-            "Vijaya Kumar": os.getenv("ZOHO_USER_ID_VIJAYA_KUMAR"),
-        }        
-        return user_id_mapping.get(sales_person_name)
+        return get_owner_resolver().resolve(sales_person_name, self)
+
+    def get_user_ids_by_name(self, sales_person_names):
+        return get_owner_resolver().resolve_many(sales_person_names, self)
 
     def split_applicant_name(self, applicant_name, sales_person):
         if not applicant_name or pd.isna(applicant_name):
@@ -532,9 +847,7 @@ class ZohoCRMAutomatedAuth:
         else:
             return "Digital", "Lead"
 
-    def create_lead_from_cmda_record(self, cmda_record):
-        if not self.ensure_valid_token():
-            return False        
+    def build_lead_data(self, cmda_record, verbose=True):
         Architect_Name = f"{cmda_record.get('Architect Name', '')} {cmda_record.get('Architect Address', '')} {cmda_record.get('Architect Email', '')}"
         Architect_Name = Architect_Name.replace("nan", "").strip()
         How_Much_Square_Feet = cmda_record.get("Dwelling Unit Info", "")
@@ -550,10 +863,11 @@ class ZohoCRMAutomatedAuth:
         if sales_person and self.clean_value(sales_person):
             sales_person_clean = sales_person.strip()
             owner_id = self.get_user_id_by_name(sales_person_clean)
-            if owner_id:
-                print(f"✅ Found user ID for {sales_person_clean}: {owner_id}")
-            else:
-                print(f"⚠️ No user ID mapping found for: {sales_person_clean}")        
+            if verbose:
+                if owner_id:
+                    print(f"✅ Found user ID for {sales_person_clean}: {owner_id}")
+                else:
+                    print(f"⚠️ No user ID mapping found for: {sales_person_clean}")        
         applicant_name = cmda_record.get("Applicant Name", "")
         first_name, last_name = self.split_applicant_name(applicant_name, sales_person_clean)
         lead_data = {
@@ -575,20 +889,103 @@ class ZohoCRMAutomatedAuth:
         }
         if owner_id:
             lead_data["Owner"] = owner_id
-            print(f"🎯 Setting Owner field to: {owner_id}")        
+            if verbose:
+                print(f"🎯 Setting Owner field to: {owner_id}")        
         self.handle_numeric_fields(lead_data, cmda_record)
         self.handle_picklist_fields(lead_data, cmda_record)
         self.handle_date_fields(lead_data, cmda_record)
-        lead_data = self.final_data_cleaning(lead_data)        
+        return self.final_data_cleaning(lead_data)
+
+    def build_leads_data(self, df):
+        # Batch version of build_lead_data: each derived column is computed once for the whole
+        # frame. Returns (payloads, errors) aligned with the rows; rows build_lead_data would
+        # reject are re-run through it so they carry the same exception in errors.
+        df = df.reset_index(drop=True)
+        index = df.index
+        columns = {}
+        clean = lambda name: _clean_text(_column(df, name, ""))
+        architect = _as_text(_column(df, "Architect Name", "")) + " " + _as_text(_column(df, "Architect Address", "")) + " " + _as_text(_column(df, "Architect Email", ""))
+        architect = architect.str.replace("nan", "", regex=False).str.strip()
+        units = _first_int(_as_text(_column(df, "Dwelling Unit Info", "")))
+        sales_person = _column(df, "Sales Person", "")
+        sales_person_clean = _clean_text(sales_person)
+        has_sales_person = _truthy(sales_person) & (sales_person_clean != "")
+        sales_person_is_str = _is_str(sales_person)
+        owners = pd.Series(None, index=index, dtype=object)
+        lookup = has_sales_person & sales_person_is_str
+        if lookup.any():
+            owner_ids = {name: owner_id for name, owner_id in self.get_user_ids_by_name(sales_person_clean[lookup].unique()).items() if owner_id}
+            owners[lookup] = sales_person_clean[lookup].map(owner_ids)
+        applicant = _column(df, "Applicant Name", "")
+        applicant_text = _as_text(applicant).str.strip()
+        has_applicant = _truthy(applicant)
+        fallback_rows = (has_sales_person & ~sales_person_is_str) | (has_applicant & (applicant_text == ""))
+        sales_names = {name: self.split_sales_person_name(name) for name in sales_person_clean.unique()}
+        first_names = sales_person_clean.map(lambda name: sales_names[name][0]).astype(object)
+        last_names = sales_person_clean.map(lambda name: sales_names[name][1]).astype(object)
+        long_name = has_applicant & (applicant_text.str.len() > 40)
+        company_name = long_name & applicant_text.str.upper().str.contains("PVT|LTD|INC|LLC|CORP|ENTERPRISES|COMPANY|CO\\.", regex=True)
+        truncated = long_name & ~company_name
+        first_names[truncated] = applicant_text[truncated].str[:40]
+        last_names[truncated] = "Digital Lead"
+        split_rows = has_applicant & ~long_name & (applicant_text != "")
+        words = applicant_text[split_rows].str.split()
+        single_word = words.str.len() == 1
+        first_names[split_rows] = words.str[0]
+        last_names[split_rows] = words.str[1:].str.join(" ").where(~single_word, "Digital Lead")
+        columns["Planning_Permission_No"] = clean("Planning Permission No.")
+        columns["Email"] = clean("Email ID")
+        columns["Phone"] = clean("Mobile No.")
+        columns["Company"] = applicant
+        columns["First_Name"] = first_names
+        columns["Last_Name"] = last_names
+        columns["Nature_of_Development"] = clean("Nature of Development")
+        columns["Area_Name"] = clean("Area Name")
+        columns["Site_Address"] = clean("Site Address")
+        columns["Reference"] = pd.Series("Digital Lead Abhishek", index=index, dtype=object)
+        columns["Architect_Name"] = architect
+        columns["Architect_Phone"] = _column(df, "Architect Mobile", "Not Provided")
+        columns["Lead_Source"] = pd.Series("Digital Leads", index=index, dtype=object)
+        columns["How_Much_Square_Feet"] = (units * 1000).map(str)
+        columns["Billing_Area"] = clean("Applicant Address")
+        columns["Owner"] = owners
+        columns["No_of_Bathrooms"] = units * 2
+        columns["No_of_Units"] = units
+        which_brand = _column(df, "Which_Brand_Looking_for", "")
+        which_brand_clean = _clean_text(which_brand)
+        columns["Which_Brand_Looking_for"] = which_brand_clean.where(_truthy(which_brand) & (which_brand_clean != ""), None)
+        columns["Future_Projects"] = pd.Series("-None-", index=index, dtype=object)
+        permit = _column(df, "Date of permit", "")
+        permit_text = _as_text(permit)
+        columns["Date_of_Permit"] = _format_day_first_dates(permit, "%d-%m-%Y", _is_str(permit) & (permit_text.str.len() == 10) & permit_text.str.contains("-", regex=False))
+        application = _column(df, "Date of Application", "")
+        columns["Date_of_Application"] = _format_day_first_dates(application, "%d/%m/%Y", _is_str(application) & _as_text(application).str.contains("/", regex=False))
+        keys = list(columns)
+        cells = [_present_cells(columns[key], raw=key in ("Company", "Architect_Phone")).tolist() for key in keys]
+        payloads = [{key: value for key, value in zip(keys, row) if value is not _DROPPED} for row in zip(*cells)]
+        errors = {}
+        if fallback_rows.any():
+            records = df[fallback_rows].to_dict("records")
+            for row, record in zip(index[fallback_rows], records):
+                try:
+                    payloads[row] = self.build_lead_data(record, verbose=False)
+                except Exception as e:
+                    payloads[row] = None
+                    errors[row] = e
+        return payloads, errors
+
+    def create_lead_from_cmda_record(self, cmda_record, fetch_details=True):
+        if not self.ensure_valid_token():
+            return False        
+        lead_data = self.build_lead_data(cmda_record)
         print(f"📤 Sending Lead data to Zoho CRM:")
-        print(f"   👤 First Name: {first_name}")
-        print(f"   👤 Last Name: {last_name}")
+        print(f"   👤 First Name: {lead_data.get('First_Name', 'Not set')}")
+        print(f"   👤 Last Name: {lead_data.get('Last_Name', 'Not set')}")
         print(f"   🏢 Company: {lead_data.get('Company', 'Not set')}")
         print(f"   🎯 Owner ID: {lead_data.get('Owner', 'Not set')}")
-        print(f"   👥 Sales Person: {sales_person_clean}")       
+        print(f"   👥 Sales Person: {self.clean_value(cmda_record.get('Sales Person', ''))}")       
         url = f"{self.api_base_url}/Leads"
         headers = {
-            'Authorization': f'Zoho-oauthtoken {self.access_token}',
             'Content-Type': 'application/json'
         }
         payload = {
@@ -596,7 +993,7 @@ class ZohoCRMAutomatedAuth:
             'trigger': ['workflow']
         }
         try:
-            response = requests.post(url, json=payload, headers=headers)            
+            response = self.api_request("POST", url, json=payload, headers=headers)            
             print(f"📊 Response Status: {response.status_code}")            
             if response.status_code == 201:
                 result = response.json()
@@ -604,20 +1001,7 @@ class ZohoCRMAutomatedAuth:
                 if 'data' in result:
                     for item in result['data']:
                         if item.get('status') == 'success':
-                            lead_id = item.get('details', {}).get('id', 'Unknown')
-                            created_by = item.get('details', {}).get('Created_By', {}).get('name', 'Unknown')                            
-                            lead_details = self.get_lead_details(lead_id)
-                            if lead_details:
-                                owner_name = lead_details.get('Owner', {}).get('name', 'Unknown')
-                                print(f"🎉 Lead Created Successfully!")
-                                print(f"   📝 Lead ID: {lead_id}")
-                                print(f"   👤 Created By: {created_by}")
-                                print(f"   🎯 Assigned To (Owner): {owner_name}")
-                                print(f"   👤 First Name: {lead_details.get('First_Name', 'Not set')}")
-                                print(f"   👤 Last Name: {lead_details.get('Last_Name', 'Not set')}")
-                            else:
-                                print(f"🎉 Lead Created Successfully! ID: {lead_id}")
-                                print(f"👤 Created By: {created_by}")
+                            self.print_lead_result(item, fetch_details)
                         else:
                             error_msg = item.get('message', 'Unknown error')
                             error_details = item.get('details', 'No details')
@@ -634,16 +1018,123 @@ class ZohoCRMAutomatedAuth:
             traceback.print_exc()
             return False
 
+    def print_lead_result(self, item, fetch_details=False):
+        lead_id = item.get('details', {}).get('id', 'Unknown')
+        created_by = item.get('details', {}).get('Created_By', {}).get('name', 'Unknown')
+        lead_details = self.get_lead_details(lead_id) if fetch_details else None
+        if lead_details:
+            owner_name = lead_details.get('Owner', {}).get('name', 'Unknown')
+            print(f"🎉 Lead Created Successfully!")
+            print(f"   📝 Lead ID: {lead_id}")
+            print(f"   👤 Created By: {created_by}")
+            print(f"   🎯 Assigned To (Owner): {owner_name}")
+            print(f"   👤 First Name: {lead_details.get('First_Name', 'Not set')}")
+            print(f"   👤 Last Name: {lead_details.get('Last_Name', 'Not set')}")
+        else:
+            print(f"🎉 Lead Created Successfully! ID: {lead_id}")
+            print(f"👤 Created By: {created_by}")
+
+    def create_leads_from_cmda_records(self, cmda_records, batch_size=100, fetch_details=False, upsert=None):
+        results = [{"row": i, "status": "error", "id": None, "message": "Not sent"} for i in range(len(cmda_records))]
+        if len(cmda_records) == 0:
+            return results
+        if not self.ensure_valid_token():
+            for result in results:
+                result["message"] = "No valid access token"
+            return results
+        batch_size = max(1, min(batch_size, 100))
+        if isinstance(cmda_records, pd.DataFrame):
+            planning_nos = _clean_text(_column(cmda_records, "Planning Permission No.", "")).tolist()
+            row_hashes = source_hashes(cmda_records)
+        else:
+            planning_nos = [self.clean_value(cmda_record.get("Planning Permission No.")) for cmda_record in cmda_records]
+            row_hashes = source_hashes(pd.DataFrame(list(cmda_records), dtype=object))
+        # Classify on the source hashes first so rows the ledger skips are never built into payloads.
+        pending = [(planning_nos[row], row_hashes[row], row) for row in range(len(cmda_records))]
+        upsert = self.upsert if upsert is None else upsert
+        pending, _, changed = self.filter_with_ledger("Leads", pending, push_changed=upsert)
+        pushed_rows = {row for _, _, row in pending}
+        changed_rows = {row for _, _, row in changed}
+        for row in range(len(cmda_records)):
+            if row in changed_rows:
+                results[row].update({"status": "changed", "message": "Changed since last import"})
+            elif row not in pushed_rows:
+                results[row].update({"status": "skipped", "message": "Unchanged since last import"})
+        rows = [row for _, _, row in pending]
+        if not rows:
+            payloads, errors = [], {}
+        elif isinstance(cmda_records, pd.DataFrame):
+            payloads, errors = self.build_leads_data(cmda_records if len(rows) == len(cmda_records) else cmda_records.iloc[rows])
+        else:
+            payloads, errors = [], {}
+            for i, row in enumerate(rows):
+                try:
+                    payloads.append(self.build_lead_data(cmda_records[row], verbose=False))
+                except Exception as e:
+                    payloads.append(None)
+                    errors[i] = e
+        for i, e in errors.items():
+            results[rows[i]]["message"] = f"Could not build lead: {e}"
+        pending = [(planning_no, payload_hash, (row, lead_data)) for (planning_no, payload_hash, row), lead_data in zip(pending, payloads) if lead_data is not None]
+        ledger = get_import_ledger()
+        owner_errors = 0
+        for start in range(0, len(pending), batch_size):
+            batch_entries = pending[start:start + batch_size]
+            batch_rows = [row for _, _, (row, _) in batch_entries]
+            batch = [lead_data for _, _, (_, lead_data) in batch_entries]
+            headers = {
+                'Content-Type': 'application/json'
+            }
+            url, payload = self.write_request("Leads", batch, ['workflow'], upsert, self.leads_duplicate_check_fields)
+            try:
+                response = self.api_request("POST", url, json=payload, headers=headers)
+                items = []
+                if response.status_code in (200, 201, 202, 400):
+                    try:
+                        items = response.json().get('data', [])
+                    except ValueError:
+                        items = []
+                if len(items) != len(batch):
+                    print(f"❌ Failed to create Leads batch. Status: {response.status_code}")
+                    print(f"🔍 Response: {response.text}")
+                    for row in batch_rows:
+                        results[row]["message"] = f"HTTP {response.status_code}"
+                    continue
+                pushed = []
+                for (planning_no, payload_hash, (row, _)), item in zip(batch_entries, items):
+                    details = item.get('details', {})
+                    if item.get('status') == 'success':
+                        results[row].update({"status": "success", "id": details.get('id'), "action": item.get('action', 'insert'), "message": item.get('message', 'record added')})
+                        pushed.append((planning_no, payload_hash, details.get('id')))
+                        if fetch_details:
+                            self.print_lead_result(item, fetch_details)
+                    else:
+                        results[row].update({"status": "error", "message": item.get('message', 'Unknown error'), "details": details})
+                        owner_errors += is_owner_error(item)
+                        print(f"❌ Lead creation failed for row {row}: {item.get('message', 'Unknown error')}")
+                        print(f"🔍 Error Details: {details}")
+                if ledger:
+                    ledger.record_results("Leads", pushed)
+            except Exception as e:
+                print(f"❌ Error creating Leads batch in Zoho CRM: {e}")
+                traceback.print_exc()
+                for row in batch_rows:
+                    results[row]["message"] = str(e)
+        self.forget_owners_after_rejection(owner_errors)
+        created = sum(1 for result in results if result["status"] == "success")
+        unchanged = sum(1 for result in results if result["status"] == "skipped")
+        print(f"✅ Leads batch completed: {created} created, {unchanged} unchanged, {len(changed_rows)} changed, {len(results) - created - unchanged - len(changed_rows)} failed out of {len(results)} total")
+        return results
+
     def get_lead_details(self, lead_id):
         if not self.ensure_valid_token():
             return None
         url = f"{self.api_base_url}/Leads/{lead_id}"
         headers = {
-            'Authorization': f'Zoho-oauthtoken {self.access_token}',
             'Content-Type': 'application/json'
         }        
         try:
-            response = requests.get(url, headers=headers)
+            response = self.api_request("GET", url, headers=headers)
             if response.status_code == 200:
                 return response.json().get('data', [{}])[0]
             else:
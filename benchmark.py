@@ -0,0 +1,811 @@
+import argparse
+import base64
+import json
+import socketserver
+import ssl
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"data": [{"status": "success"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/settings/modules"
+
+
+def _summarize(name, timings):
+    timings_ms = [t * 1000 for t in timings]
+    return {
+        "name": name,
+        "requests": len(timings_ms),
+        "mean_ms": round(statistics.mean(timings_ms), 3),
+        "median_ms": round(statistics.median(timings_ms), 3),
+        "p95_ms": round(sorted(timings_ms)[int(len(timings_ms) * 0.95) - 1], 3),
+        "total_s": round(sum(timings), 3),
+    }
+
+
+def bench_http(url=None, count=200):
+    import requests
+    import http_client
+    from rate_limiter import TokenBucket, set_rate_limiter
+    set_rate_limiter(TokenBucket(1e6))
+    server = None
+    if not url:
+        server, url = _start_local_server()
+    try:
+        bare = []
+        for _ in range(count):
+            start = time.perf_counter()
+            requests.get(url, timeout=http_client.get_timeout())
+            bare.append(time.perf_counter() - start)
+        pooled = []
+        http_client.get(url)
+        for _ in range(count):
+            start = time.perf_counter()
+            http_client.get(url)
+            pooled.append(time.perf_counter() - start)
+    finally:
+        if server:
+            server.shutdown()
+    results = [_summarize("bare requests.get", bare), _summarize("pooled http_client.get", pooled)]
+    results.append({"speedup": round(results[0]["mean_ms"] / results[1]["mean_ms"], 2)})
+    return results
+
+
+def _legacy_find_best_match(area_name, sales_person_areas):
+    import re
+    import pandas as pd
+
+    def normalize_text(text):
+        if pd.isna(text) or text == "":
+            return ""
+        normalized = re.sub(r'[^\w\s]', '', str(text).strip().lower())
+        return re.sub(r'\s+', ' ', normalized)
+
+    if pd.isna(area_name) or area_name.strip() == "":
+        return None
+    normalized_area = normalize_text(area_name)
+    for sales_person, areas in sales_person_areas.items():
+        for mapped_area in areas:
+            if normalized_area == normalize_text(mapped_area):
+                return sales_person
+    return None
+
+
+def _sample_areas(rows, seed=7):
+    import random
+    from helper import SALES_PERSON_AREAS
+    rng = random.Random(seed)
+    known = [area for areas in SALES_PERSON_AREAS.values() for area in areas]
+    unknown = ["Unknown Nagar", "Kilpauk", "Anna Nagar West", "", None]
+    return [rng.choice(unknown) if rng.random() < 0.1 else rng.choice(known) for _ in range(rows)]
+
+
+def _first_mismatch(legacy, new):
+    """Index of the first row where two equivalence-check outputs differ, or None."""
+    for row, (old, current) in enumerate(zip(legacy, new)):
+        if old != current:
+            return row
+    return None if len(legacy) == len(new) else min(len(legacy), len(new))
+
+
+def failed_checks(result, path="result"):
+    """Paths of every "identical"/"ok" flag that is False, at any depth of a benchmark result."""
+    failed = []
+    if isinstance(result, dict):
+        for key, value in result.items():
+            if key in ("identical", "ok") and value is False:
+                failed.append(f"{path}.{key}")
+            else:
+                failed.extend(failed_checks(value, f"{path}.{key}"))
+    elif isinstance(result, list):
+        for position, value in enumerate(result):
+            failed.extend(failed_checks(value, f"{path}[{position}]"))
+    return failed
+
+
+def bench_territory(rows=100000):
+    import pandas as pd
+    from helper import SALES_PERSON_AREAS, lookup_sales_persons
+    areas = pd.Series(_sample_areas(rows), dtype=object)
+    start = time.perf_counter()
+    legacy = areas.apply(lambda area: _legacy_find_best_match(area, SALES_PERSON_AREAS))
+    legacy_s = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = lookup_sales_persons(areas)
+    indexed_s = time.perf_counter() - start
+    mismatch = _first_mismatch(legacy.fillna("").tolist(), indexed.fillna("").tolist())
+    return {
+        "rows": rows,
+        "nested_loop_s": round(legacy_s, 3),
+        "hash_index_s": round(indexed_s, 3),
+        "speedup": round(legacy_s / indexed_s, 1) if indexed_s else None,
+        "identical": mismatch is None,
+        "first_mismatch_row": mismatch,
+    }
+
+
+def _legacy_split_shared_assignments(df, sales_col):
+    import pandas as pd
+    shared_mask = df[sales_col].str.contains('/', na=False)
+    if not shared_mask.any():
+        return df
+    final_rows = []
+    shared_groups = {}
+    for _, row in df.iterrows():
+        sales_person = row[sales_col]
+        if pd.isna(sales_person) or '/' not in sales_person:
+            final_rows.append(row)
+        else:
+            key = ' / '.join(sp.strip() for sp in sales_person.split('/'))
+            shared_groups.setdefault(key, []).append(row)
+    for shared_key, rows in shared_groups.items():
+        salespeople = shared_key.split(' / ')
+        records_per_person = len(rows) // len(salespeople)
+        remainder = len(rows) % len(salespeople)
+        start_idx = 0
+        for i, salesperson in enumerate(salespeople):
+            end_idx = start_idx + records_per_person + (1 if i < remainder else 0)
+            for row in rows[start_idx:end_idx]:
+                row_copy = row.copy()
+                row_copy[sales_col] = salesperson
+                final_rows.append(row_copy)
+            start_idx = end_idx
+    return pd.DataFrame(final_rows).reset_index(drop=True)
+
+
+def bench_split(rows=100000):
+    import pandas as pd
+    from helper import lookup_sales_persons, split_shared_assignments
+    areas = _sample_areas(rows)
+    df = pd.DataFrame({"Row": range(rows), "Area Name": areas})
+    df["Sales Person"] = lookup_sales_persons(df["Area Name"])
+    start = time.perf_counter()
+    legacy = _legacy_split_shared_assignments(df, "Sales Person")
+    legacy_s = time.perf_counter() - start
+    start = time.perf_counter()
+    vectorized = split_shared_assignments(df, "Sales Person")
+    vectorized_s = time.perf_counter() - start
+    mismatch = _first_mismatch(legacy.astype(object).fillna("").values.tolist(), vectorized.astype(object).fillna("").values.tolist())
+    return {
+        "rows": rows,
+        "shared_rows": int(df["Sales Person"].str.contains('/', na=False).sum()),
+        "iterrows_s": round(legacy_s, 3),
+        "vectorized_s": round(vectorized_s, 3),
+        "speedup": round(legacy_s / vectorized_s, 1) if vectorized_s else None,
+        "identical": mismatch is None,
+        "first_mismatch_row": mismatch,
+    }
+
+
+def bench_keywords(rows=500000):
+    # Lambda any() scan vs filter_development_records, on the usual repetitive Nature of
+    # Development texts and on texts that are all distinct (the worst case for the
+    # one-search-per-distinct-text lookup).
+    import contextlib
+    import io
+    import random
+    import pandas as pd
+    from helper import DEVELOPMENT_KEYWORDS, filter_development_records
+    rng = random.Random(11)
+    natures = [
+        "Proposed construction of Stilt floor + 4 floors Residential Building with 8 dwelling units",
+        "Proposed construction of Ground + 2 floors School Building",
+        "Proposed construction of Ground + 1 floor Office Building",
+        "Planning Permission for Commercial Building with Premium FSI",
+        "Proposed Industrial Shed",
+    ]
+    picked = [rng.choice(natures) for _ in range(rows)]
+    dwelling = [rng.choice([None, "", "8 dwelling units"]) for _ in range(rows)]
+    results = {"rows": rows}
+    for name, texts in (("repeated", picked), ("distinct", [f"{text} (file {i})" for i, text in enumerate(picked)])):
+        df = pd.DataFrame({"Nature of Development": texts, "Dwelling Unit Info": dwelling})
+        start = time.perf_counter()
+        cond1 = df["Dwelling Unit Info"].notna() & (df["Dwelling Unit Info"].astype(str).str.strip() != "")
+        nature_lower = df["Nature of Development"].astype(str).str.lower().str.strip()
+        cond2 = df["Dwelling Unit Info"].isna() | (df["Dwelling Unit Info"].astype(str).str.strip() == "")
+        cond2 = cond2 & nature_lower.apply(lambda x: any(k in x for k in DEVELOPMENT_KEYWORDS))
+        legacy_matched = df[cond1 | cond2]
+        legacy_s = time.perf_counter() - start
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            matched_df, _ = filter_development_records(df)
+        current_s = time.perf_counter() - start
+        results[name] = {
+            "lambda_any_s": round(legacy_s, 3),
+            "filter_s": round(current_s, 3),
+            "speedup": round(legacy_s / current_s, 1) if current_s else None,
+            "identical": legacy_matched.index.equals(matched_df.index),
+        }
+    return results
+
+
+CMDA_COLUMNS = [
+    "File No.", "Planning Permission No.", "Permit No.", "Date of permit", "Date of Application",
+    "Mobile No.", "Email ID", "Applicant Name", "Applicant Address", "Nature of Development",
+    "Dwelling Unit Info", "Site Address", "Area Name", "Architect Name", "Architect Address",
+    "Architect Email", "Architect Mobile", "View Online", "Approved Plan", "Approval Letter",
+]
+
+
+NON_RESIDENTIAL_NATURES = [
+    "Proposed construction of Ground floor + 2 floors Commercial Building (Shops)",
+    "Proposed construction of Hospital building with Stilt floor + 5 floors",
+    "Proposed construction of School building Ground + 2 floors",
+    "Proposed additional construction of First floor Office Building",
+    "Proposed construction of Kalyana Mandapam Ground + 1 floor",
+    "Proposed construction of Industrial Building (Warehouse)",
+]
+
+
+def write_synthetic_workbook(path, rows, seed=3):
+    # Shaped after Original_Data_Set.xlsx: day-first date strings, mobiles stored as text
+    # (sometimes "Not Found"), empty architect columns, and the dwelling count repeated in
+    # the Nature of Development text. About a fifth of the rows are non-residential, so the
+    # development filter and the territory lookup both see misses.
+    import random
+    from openpyxl import Workbook
+    rng = random.Random(seed)
+    areas = _sample_areas(rows, seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(CMDA_COLUMNS)
+    for i in range(rows):
+        units = rng.choice([4, 6, 8, 16, 24, 48])
+        floors = rng.choice(["Stilt floor + 3 floors", "Stilt floor + 4 floors", "Stilt Floor (Parking) + 3 Floors"])
+        if rng.random() < 0.2:
+            nature, dwelling = rng.choice(NON_RESIDENTIAL_NATURES), None
+        else:
+            nature = f"Planning Permission for the proposed construction of {floors} Residential Building with {units} dwelling units"
+            dwelling = f"{units} {rng.choice(['dwelling units', 'Dwelling units'])}"
+        has_architect = rng.random() < 0.3
+        sheet.append([
+            f"CMDA/PP/NHRB/S/{i:04d}/2025", f"OL-PP/NHRB/{i:04d}/2025", f"OL-{i:05d}",
+            f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-2025", f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+            "Not Found" if rng.random() < 0.05 else str(rng.randint(6000000000, 9999999999)),
+            f"applicant{i}@example.com", rng.choice([f"APPLICANT {i}", f"M/s. APPLICANT {i} PROPERTIES PVT LTD", f"Thiru. R. Applicant {i}"]),
+            f"No.{i}, Main Road, Chennai - 600 0{rng.randint(10, 99)}", nature, dwelling, f"Plot No.{i}, Chennai", areas[i],
+            "Architect Name" if has_architect else None, "Architect Address" if has_architect else None,
+            "architect@example.com" if has_architect else None, "9000000000" if has_architect else None,
+            "View PDF", "View Approved Plan", "View Approval Letter",
+        ])
+    workbook.save(path)
+
+
+def _stream_peak(path, chunk_size):
+    import tracemalloc
+    from helper import iter_workbook_chunks, filter_development_records, split_by_assignment, dataframe_to_records
+    tracemalloc.start()
+    records = 0
+    for chunk in iter_workbook_chunks(path, chunk_size):
+        matched_df, _ = filter_development_records(chunk)
+        assigned_df, _ = split_by_assignment(matched_df)
+        records += len(dataframe_to_records(assigned_df))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return records, peak
+
+
+def _full_read_peak(path):
+    import tracemalloc
+    from helper import read_workbook, dataframe_to_records
+    tracemalloc.start()
+    records = len(dataframe_to_records(read_workbook(path)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return records, peak
+
+
+def bench_stream(rows=50000, chunk_size=2000):
+    import contextlib
+    import io
+    import os
+    import tempfile
+    results = []
+    for size in (rows, rows * 2):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"synthetic_{size}.xlsx")
+            write_synthetic_workbook(path, size)
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, full_peak = _full_read_peak(path)
+                _, stream_peak = _stream_peak(path, chunk_size)
+        results.append({"rows": size, "full_read_peak_mb": round(full_peak / 2**20, 1), "stream_peak_mb": round(stream_peak / 2**20, 1)})
+    # Doubling the file should leave the streaming peak roughly where it was.
+    bounded = results[1]["stream_peak_mb"] <= results[0]["stream_peak_mb"] * 1.25 + 1
+    return {"chunk_size": chunk_size, "runs": results, "ok": bounded}
+
+
+def synthetic_cmda_frame(rows, seed=11):
+    # In-memory CMDA rows with the awkward values real sheets contain: numeric mobiles,
+    # blank and "nan" dwelling info, bad emails, mixed date formats and unknown owners.
+    import random
+    import pandas as pd
+    rng = random.Random(seed)
+    areas = _sample_areas(rows, seed)
+    owners = ["Karthik", "Jagan ", "Abhishek R G", "Unknown Person", None, ""]
+    dates = ["2025-03-04 10:15:00", "2025-03-04", "04-03-2025", "2025-3-4", pd.Timestamp("2025-03-04 09:00:00"), None]
+    data = []
+    for i in range(rows):
+        units = rng.choice([0, 4, 6, 16, 24])
+        data.append({
+            "Planning Permission No.": rng.choice([f"OL-PP/NHRB/{i:05d}/2025", f" OL-PP/{i} ", "nan", None]),
+            "Sales Person": rng.choice(owners + ["Abhishek R G", "Vijaya Kumar"]),
+            "Email ID": rng.choice([f"applicant{i}@example.com", " spaced@example.com ", "no-at-sign.com", "name@localhost", None]),
+            "Mobile No.": rng.choice([float(rng.randint(6000000000, 9999999999)), rng.randint(6000000000, 9999999999), "+91 98400-12345", None]),
+            "Date of permit": rng.choice([pd.Timestamp(2025, rng.randint(1, 12), rng.randint(1, 28)), f"{rng.randint(1, 28):02d}-03-2025", None]),
+            "Applicant Name": rng.choice([f" APPLICANT {i} ", f"Ravi{i}", f"Sri  Ananth   Builders {i}", "   ", "", None, f"{'LONG NAME ' * 5}{i}", f"SRI LAKSHMI HOMES AND INFRA DEVELOPERS PVT LTD {i}"]),
+            "Company_Name": rng.choice([f"Company {i}", None]),
+            "Nature of Development": f"Residential building with {units} dwelling units",
+            "Dwelling Unit Info": rng.choice([f"{units} dwelling units", units, "  ", "nan", "NIL", "007 units", None]),
+            "Creation_Time": rng.choice(dates),
+            "How_Much_Square_Feet": rng.choice(["1200 sq.ft", 950.5, "approx", None]),
+            "Area Name": areas[i],
+            "Site Address": f"Plot No.{i}, Chennai",
+            "Applicant Address": rng.choice([f"{i}, Main Road", "null", None]),
+            "Date of Application": rng.choice([f"{rng.randint(1, 28):02d}/03/2025", "31/02/2025", "2025/03/04", pd.Timestamp(2025, 3, 4), None]),
+            "Architect Name": rng.choice(["Ananth Associates", None]),
+            "Architect Address": rng.choice([f"{i}, Anna Salai", None]),
+            "Architect Email": rng.choice(["architect@example.com", None]),
+            "Architect Mobile": rng.choice(["9000000000", 9000000000.0, None]),
+            "Which_Brand_Looking_for": rng.choice(["Jaquar", " none ", None]),
+        })
+    return pd.DataFrame(data)
+
+
+def bench_formatter(rows=20000):
+    import contextlib
+    import io
+    import os
+    import re
+    from helper import dataframe_to_records
+    from ZohoCRMAutomatedAuth import ZohoCRMAutomatedAuth
+    os.environ.setdefault("ZOHO_USER_ID_KARTHIK", "5000000000001")
+    os.environ.setdefault("ZOHO_USER_ID_ABHISHEK", "5000000000002")
+    df = synthetic_cmda_frame(rows)
+    crm = ZohoCRMAutomatedAuth()
+    crm.ensure_valid_token = lambda: True
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        legacy = [crm.format_record_for_zoho(record) for record in dataframe_to_records(df)]
+        legacy_s = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = crm.format_records_for_zoho(df)
+        batch_s = time.perf_counter() - start
+    # Golden check: the serialized payloads must match byte for byte (key order included).
+    # Rows with no applicant or company are named Record_<now>, so the clock is masked out.
+    serialize = lambda payloads: [re.sub(r"Record_\d{14}", "Record_", json.dumps(payload, ensure_ascii=False)) for payload in payloads]
+    mismatch = _first_mismatch(serialize(legacy), serialize(batch))
+    return {
+        "rows": rows,
+        "per_record_s": round(legacy_s, 3),
+        "column_wise_s": round(batch_s, 3),
+        "speedup": round(legacy_s / batch_s, 1) if batch_s else None,
+        "identical": mismatch is None,
+        "first_mismatch_row": mismatch,
+    }
+
+
+def bench_leads(rows=20000):
+    import contextlib
+    import io
+    import os
+    from ZohoCRMAutomatedAuth import ZohoCRMAutomatedAuth
+    os.environ.setdefault("ZOHO_USER_ID_KARTHIK", "5000000000001")
+    os.environ.setdefault("ZOHO_USER_ID_ABHISHEK", "5000000000002")
+    df = synthetic_cmda_frame(rows)
+    crm = ZohoCRMAutomatedAuth()
+    crm.ensure_valid_token = lambda: True
+    def build_one(record):
+        try:
+            return crm.build_lead_data(record, verbose=False)
+        except Exception as e:
+            return f"error: {e}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        legacy = [build_one(record) for record in df.to_dict("records")]
+        legacy_s = time.perf_counter() - start
+        start = time.perf_counter()
+        payloads, errors = crm.build_leads_data(df)
+        batch_s = time.perf_counter() - start
+    batch = [f"error: {errors[row]}" if row in errors else payload for row, payload in enumerate(payloads)]
+    # Golden check against build_lead_data, the per-row builder create_lead_from_cmda_record uses.
+    serialize = lambda payloads: [json.dumps(payload, ensure_ascii=False) for payload in payloads]
+    mismatch = _first_mismatch(serialize(legacy), serialize(batch))
+    return {
+        "rows": rows,
+        "per_record_s": round(legacy_s, 3),
+        "column_wise_s": round(batch_s, 3),
+        "speedup": round(legacy_s / batch_s, 1) if batch_s else None,
+        "rows_rejected": len(errors),
+        "identical": mismatch is None,
+        "first_mismatch_row": mismatch,
+    }
+
+
+def run_import_once(workbook, base_url, result_path, chunk_size=0, access_token="benchmark", refresh_token="benchmark", client_limit=False):
+    # Runs in a fresh interpreter (see bench_import) so peak RSS belongs to this one import.
+    # client_limit keeps the app's own rate limiter; otherwise it is opened up so only the
+    # stand-in's latency and 429s shape the run.
+    import contextlib
+    import io
+    import os
+    import resource
+    import tempfile
+    from datetime import datetime, timedelta
+    work_dir = tempfile.mkdtemp()
+    token_file = os.path.join(work_dir, "tokens.json")
+    with open(token_file, "w") as f:
+        json.dump({"access_token": access_token, "refresh_token": refresh_token, "expires_at": (datetime.now() + timedelta(days=1)).isoformat()}, f)
+    os.environ.update({
+        "API_BASE_URL": f"{base_url}/crm/v2",
+        "TOKEN_URL": f"{base_url}/oauth/v2/token",
+        "TOKEN_FILE_NAME": token_file,
+        "ZOHO_MODEL_NAME": "CMDA_Benchmark",
+        "IMPORT_LEDGER_PATH": os.path.join(work_dir, "ledger.sqlite3"),
+        "ZOHO_UPSERT": "false",
+    })
+    if not client_limit:
+        from rate_limiter import TokenBucket, set_rate_limiter
+        set_rate_limiter(TokenBucket(1e6))
+    from Integration import lead_import
+    stages, started = {}, {}
+    def progress(stage, status=None, **info):
+        now = time.perf_counter()
+        if status == "running":
+            started.setdefault(stage, now)
+        elif stage in started:
+            stages[stage] = stages.get(stage, 0.0) + now - started.pop(stage)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = lead_import(workbook, send_email=False, progress=progress, chunk_size=chunk_size)
+    wall = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    counts = (response.get("data") or [{}])[0]
+    result = {
+        "status": response.get("statusCode"),
+        "wall_s": round(wall, 3),
+        "stages_s": {stage: round(seconds, 3) for stage, seconds in stages.items()},
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "import_rss_mb": round((peak_kb - baseline_kb) / 1024, 1),
+        "cmda": counts.get("cmda"),
+        "leads": counts.get("leads"),
+    }
+    with open(result_path, "w") as f:
+        json.dump(result, f)
+
+
+def _git_commit():
+    import subprocess
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def bench_import(sizes="1000,10000,100000", chunk_size=0, output="benchmark_results.json", latency_ms=0, rate_limit=0, failure_rate=0.0):
+    # End-to-end lead_import against the fake_zoho stand-in, one subprocess per workbook size.
+    # Each run is appended to `output` and compared with the previous run for the same size
+    # and stand-in settings.
+    import os
+    import platform
+    import subprocess
+    import sys
+    import tempfile
+    import pandas as pd
+    from fake_zoho import FakeZoho
+    fake = FakeZoho(latency_ms=latency_ms, rate_limit=rate_limit, rate_window=1, failure_rate=failure_rate, modules=("Leads", "CMDA_Benchmark"), seed=5)
+    base_url = fake.start()
+    settings = {"latency_ms": latency_ms, "rate_limit": rate_limit, "failure_rate": failure_rate}
+    here = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for rows in [int(size) for size in str(sizes).split(",") if size.strip()]:
+                workbook = os.path.join(tmp, f"cmda_{rows}.xlsx")
+                start = time.perf_counter()
+                write_synthetic_workbook(workbook, rows)
+                generate_s = time.perf_counter() - start
+                result_path = os.path.join(tmp, f"result_{rows}.json")
+                access_token, refresh_token = fake.issue_token()
+                code = "import sys, benchmark; benchmark.run_import_once(sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5], sys.argv[6], sys.argv[7] == '1')"
+                argv = [workbook, base_url, result_path, str(chunk_size), access_token, refresh_token, "1" if rate_limit else "0"]
+                completed = subprocess.run([sys.executable, "-c", code, *argv], cwd=here, capture_output=True, text=True)
+                if completed.returncode != 0:
+                    raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+                with open(result_path) as f:
+                    runs.append({"rows": rows, "chunk_size": chunk_size, **settings, "generate_s": round(generate_s, 3), **json.load(f), "stand_in": fake.stats()})
+                fake.reset()
+    finally:
+        fake.stop()
+    entry = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "runs": runs,
+    }
+    history = []
+    if output and os.path.exists(output):
+        with open(output) as f:
+            history = json.load(f)
+    def run_key(run):
+        return (run["rows"], run.get("chunk_size", 0), run.get("latency_ms", 0), run.get("rate_limit", 0), run.get("failure_rate", 0.0))
+    previous = {run_key(run): run for past in history for run in past["runs"]}
+    for run in runs:
+        before = previous.get(run_key(run))
+        if before:
+            run["wall_vs_previous"] = round(run["wall_s"] / before["wall_s"], 2) if before["wall_s"] else None
+            run["rss_vs_previous"] = round(run["peak_rss_mb"] / before["peak_rss_mb"], 2) if before["peak_rss_mb"] else None
+    if output:
+        with open(output, "w") as f:
+            json.dump(history + [entry], f, indent=2)
+    return entry
+
+
+def _copy_workbook_rows(source, target, rows):
+    # Writes the header and the first `rows` data rows of `source` to `target`, values unchanged.
+    from openpyxl import Workbook, load_workbook
+    workbook = load_workbook(source, read_only=True)
+    copy = Workbook(write_only=True)
+    sheet = copy.create_sheet()
+    for n, row in enumerate(workbook.active.iter_rows(values_only=True)):
+        if n > rows:
+            break
+        sheet.append(row)
+    workbook.close()
+    copy.save(target)
+
+
+def check_ledger(rows=600, extra=100, chunk_size=100):
+    # Re-imports against the fake_zoho stand-in with a fresh ledger:
+    #   1. a workbook of `rows` rows,
+    #   2. a superset with `extra` more rows (only the new rows may be pushed),
+    #   3. the superset again in chunks of `chunk_size` (nothing may be pushed).
+    # No run may flag an untouched row as changed.
+    import contextlib
+    import io
+    import os
+    import tempfile
+    from datetime import datetime, timedelta
+    from fake_zoho import FakeZoho
+    fake = FakeZoho(modules=("Leads", "CMDA_Benchmark"))
+    fake.start()
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            superset, subset = os.path.join(tmp, "superset.xlsx"), os.path.join(tmp, "subset.xlsx")
+            write_synthetic_workbook(superset, rows + extra)
+            _copy_workbook_rows(superset, subset, rows)
+            access_token, refresh_token = fake.issue_token()
+            token_file = os.path.join(tmp, "tokens.json")
+            with open(token_file, "w") as f:
+                json.dump({"access_token": access_token, "refresh_token": refresh_token, "expires_at": (datetime.now() + timedelta(days=1)).isoformat()}, f)
+            os.environ.update({
+                **fake.env(),
+                "TOKEN_FILE_NAME": token_file,
+                "ZOHO_MODEL_NAME": "CMDA_Benchmark",
+                "IMPORT_LEDGER_PATH": os.path.join(tmp, "ledger.sqlite3"),
+                "ZOHO_UPSERT": "false",
+            })
+            from rate_limiter import TokenBucket, set_rate_limiter
+            set_rate_limiter(TokenBucket(1e6))
+            from Integration import lead_import
+            for name, workbook, chunks in (("subset", subset, 0), ("superset", superset, 0), ("superset_chunked", superset, chunk_size)):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    response = lead_import(workbook, send_email=False, chunk_size=chunks)
+                counts = (response.get("data") or [{}])[0]
+                runs.append({"run": name, "status": response.get("statusCode"), "cmda": counts.get("cmda"), "leads": counts.get("leads")})
+            from import_ledger import get_import_ledger
+            get_import_ledger().close()
+    finally:
+        fake.stop()
+    first, second, third = runs
+    pushed = {target: first[target]["successful"] for target in ("cmda", "leads")}
+    ok = all(run["status"] == 200 for run in runs) and all(
+        second[target]["changed"] == 0 and second[target]["skipped"] == pushed[target] and second[target]["successful"] > 0
+        and third[target]["changed"] == 0 and third[target]["successful"] == 0
+        for target in ("cmda", "leads")
+    )
+    return {"runs": runs, "ok": ok}
+
+
+class _SMTPAuthHandler(socketserver.StreamRequestHandler):
+    # Just enough SMTP to check the outbox logs in: mail is refused with 530 until AUTH PLAIN succeeds.
+
+    def _reply(self, *lines):
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+    def handle(self):
+        authenticated = False
+        self._reply("220 localhost ESMTP stub")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            self.server.commands.append(verb)
+            if verb == "EHLO":
+                self._reply("250-localhost", "250 AUTH PLAIN")
+            elif verb == "AUTH":
+                parts = command.split()
+                credentials = base64.b64decode(parts[2]).split(b"\0") if len(parts) == 3 else []
+                authenticated = len(credentials) == 3 and credentials[2].decode() == self.server.password
+                self._reply("235 2.7.0 Authentication successful" if authenticated else "535 5.7.8 Authentication failed")
+            elif verb == "MAIL" and not authenticated:
+                self._reply("530 5.7.0 Authentication Required")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.delivered += 1
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP", "HELO"):
+                self._reply("250 OK")
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _SMTPStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password, certfile=None, keyfile=None):
+        super().__init__(("localhost", 0), _SMTPAuthHandler)
+        self.password = password
+        self.commands = []
+        self.delivered = 0
+        self.tls = None
+        if certfile:
+            self.tls = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            self.tls.load_cert_chain(certfile, keyfile)
+
+    def get_request(self):
+        sock, address = super().get_request()
+        if self.tls:
+            sock = self.tls.wrap_socket(sock, server_side=True)
+        return sock, address
+
+
+def check_smtp():
+    # Sends one report through MailOutbox to a local SMTP server that requires AUTH, over
+    # implicit SSL (the default Gmail setup, with a throwaway self-signed certificate) and
+    # over plain SMTP. Fails unless both log in and deliver.
+    import os
+    import subprocess
+    import tempfile
+    from email.mime.text import MIMEText
+    from mail_outbox import MailOutbox
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+                        "-addext", "subjectAltName=DNS:localhost", "-keyout", keyfile, "-out", certfile], check=True, capture_output=True)
+        for use_ssl in (True, False):
+            server = _SMTPStubServer("stub-password", certfile if use_ssl else None, keyfile)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            os.environ.update({
+                "SMTP_HOST": "localhost",
+                "SMTP_PORT": str(server.server_address[1]),
+                "SMTP_USE_SSL": "true" if use_ssl else "false",
+                "SMTP_CA_FILE": certfile,
+                "SMTP_MAX_RETRIES": "0",
+                "APP_PASSWORD": "stub-password",
+            })
+            outbox = MailOutbox()
+            msg = MIMEText("SMTP outbox check")
+            msg["Subject"] = "Outbox check"
+            msg["From"] = outbox.sender
+            msg["To"] = "reports@example.com"
+            outbox.enqueue(msg, ["reports@example.com"])
+            outbox.flush(timeout=15)
+            outbox._close()
+            server.shutdown()
+            server.server_close()
+            runs.append({"ssl": use_ssl, "sent": outbox.sent, "failed": outbox.failed, "delivered": server.delivered, "commands": server.commands})
+    return {
+        "runs": runs,
+        "ok": all(run["sent"] == 1 and run["delivered"] == 1 and "AUTH" in run["commands"] for run in runs),
+    }
+
+
+HEAVY_MODULES = ("selenium", "pandas", "fuzzywuzzy", "openpyxl", "smtplib", "ZohoCRMAutomatedAuth", "Integration")
+
+
+def _import_times(module, runs):
+    import subprocess
+    import sys
+    totals, loaded = [], set()
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+        cumulative = {}
+        for line in completed.stderr.splitlines():
+            # "import time:  self [us] | cumulative | imported package"
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|", 1).split("|")]
+            cumulative[name] = int(cumulative_us)
+            loaded.add(name.split(".")[0])
+        totals.append(cumulative.get(module, 0))
+    return totals, loaded
+
+
+def bench_startup(module="main", runs=5):
+    # Cold-import cost of the API entry point as reported by `python -X importtime`.
+    totals, loaded = _import_times(module, runs)
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals) / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "heavy_modules_loaded": sorted(name for name in HEAVY_MODULES if name in loaded),
+    }
+
+
+BENCHMARKS = {
+    "http": lambda args: bench_http(args.url, args.count),
+    "territory": lambda args: bench_territory(args.rows),
+    "split": lambda args: bench_split(args.rows),
+    "keywords": lambda args: bench_keywords(args.rows),
+    "stream": lambda args: bench_stream(args.rows, args.chunk_size),
+    "formatter": lambda args: bench_formatter(args.rows),
+    "leads": lambda args: bench_leads(args.rows),
+    "import": lambda args: bench_import(args.sizes, args.import_chunk_size, args.output, args.latency_ms, args.rate_limit, args.failure_rate),
+    "startup": lambda args: bench_startup(args.module, args.runs),
+    "smtp": lambda args: check_smtp(),
+    "ledger": lambda args: check_ledger(),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the Zoho CRM integration")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--import-chunk-size", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    result = BENCHMARKS[args.benchmark](args)
+    print(json.dumps(result, indent=2, default=str))
+    failed = failed_checks(result)
+    if failed:
+        print(f"❌ Check failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
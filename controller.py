@@ -1,22 +1,102 @@
-from Integration import lead_import
+from jobs import submit_import, get_job, JobQueueFull
 import os
+from io import BytesIO
+
+XLSX_SIGNATURE = b"PK\x03\x04"
+
+def run_lead_import(*args, **kwargs):
+    # Integration pulls in pandas, fuzzywuzzy and the Zoho client; importing it in the
+    # worker keeps server startup light and the first request off the event loop.
+    from Integration import lead_import
+    return lead_import(*args, **kwargs)
 
 def lead_validation(file_path):
     try:
         if not os.path.exists(file_path):
             return {
                 "message": "The file path you provided does not exist. Please check the path and try again.",
-                "statusCode": 400,  
+                "statusCode": 400,
                 "status": False,
                 "data": [{}]
             }
         else:
-            return lead_import(file_path)
+            job_id = submit_import(run_lead_import, file_path)
+            return {
+                "message": "Lead import queued. Poll /api/jobs/{job_id} for progress.",
+                "statusCode": 202,
+                "status": True,
+                "data": [{"job_id": job_id}]
+            }
+    except JobQueueFull as e:
+        return {
+            "message": str(e),
+            "statusCode": 429,
+            "status": False,
+        }
     except Exception as e:
         return {
             "message": str(e),
             "statusCode": 400,
             "status": False,
         }
-    
-    
+
+def upload_validation(file_name, content):
+    try:
+        if not file_name or not file_name.lower().endswith(".xlsx"):
+            return {
+                "message": "Please upload an Excel workbook (.xlsx).",
+                "statusCode": 400,
+                "status": False,
+                "data": [{}]
+            }
+        if not content:
+            return {
+                "message": "The uploaded file is empty.",
+                "statusCode": 400,
+                "status": False,
+                "data": [{}]
+            }
+        # An .xlsx workbook is a zip archive; anything else would only fail later inside the job.
+        if not content.startswith(XLSX_SIGNATURE):
+            return {
+                "message": "The uploaded file is not a valid Excel workbook (.xlsx).",
+                "statusCode": 400,
+                "status": False,
+                "data": [{}]
+            }
+        job_id = submit_import(run_lead_import, BytesIO(content), original_file_name=os.path.basename(file_name))
+        return {
+            "message": "Lead import queued. Poll /api/jobs/{job_id} for progress.",
+            "statusCode": 202,
+            "status": True,
+            "data": [{"job_id": job_id}]
+        }
+    except JobQueueFull as e:
+        return {
+            "message": str(e),
+            "statusCode": 429,
+            "status": False,
+        }
+    except Exception as e:
+        return {
+            "message": str(e),
+            "statusCode": 400,
+            "status": False,
+        }
+
+def job_status(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return {
+            "message": "No import job found with this ID.",
+            "statusCode": 404,
+            "status": False,
+            "data": [{}]
+        }
+    return {
+        "message": f"Import job is {job['state']}",
+        "statusCode": 200,
+        "status": True,
+        "data": [job]
+    }
+
@@ -0,0 +1,412 @@
+import argparse
+import json
+import math
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for the parts of Zoho CRM this project talks to, for load and
+# latency testing without touching production:
+#   POST /oauth/v2/token                 authorization_code and refresh_token grants
+#   GET  /crm/v2/settings/modules        configured modules plus any written to
+#   GET  /crm/v2/users                   active users (paged like Zoho)
+#   POST /crm/v2/{module}[/upsert]       insert / upsert, at most 100 records per call
+#   GET  /crm/v2/{module}/{id}           read back a stored record
+# Records live in memory. Every CRM call can be slowed down (latency/jitter),
+# throttled with 429s once a per-window request budget is spent, and individual
+# records fail at a configurable rate. With check_owners, records whose Owner or
+# Lead_Owner holds a user ID that is not an active user fail with INVALID_DATA,
+# as Zoho does for deactivated users. Point the app at it with
+#   API_BASE_URL=http://127.0.0.1:8090/crm/v2
+#   TOKEN_URL=http://127.0.0.1:8090/oauth/v2/token
+
+MAX_RECORDS_PER_CALL = 100
+
+DEFAULT_MODULES = ("Leads", "CMDA")
+
+DEFAULT_USERS = (
+    ("Abhishek", "R G"),
+    ("Karthik", ""),
+    ("Jagan", ""),
+    ("Dinakaran", ""),
+    ("Venkatesh", ""),
+    ("Ameen", "Syed"),
+    ("Balachander", ""),
+    ("Vijaya", "Kumar"),
+)
+
+MANDATORY_FIELDS = {"Leads": ("Last_Name",)}
+
+OWNER_FIELDS = ("Owner", "Lead_Owner")
+
+
+def _match_key(value):
+    # Only plain values can be upsert match keys; lists and lookups never match.
+    return value if isinstance(value, (str, int, float)) and value != "" else None
+
+
+def _user(n, first_name, last_name):
+    return {
+        "id": str(4000000000000 + n),
+        "first_name": first_name,
+        "last_name": last_name,
+        "full_name": f"{first_name} {last_name}".strip(),
+        "status": "active",
+    }
+
+
+class FakeZoho:
+
+    def __init__(self, latency_ms=0, jitter_ms=0, rate_limit=0, rate_window=60, failure_rate=0.0,
+                 token_ttl=3600, modules=DEFAULT_MODULES, users=None, require_auth=True, seed=None, check_owners=False):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.failure_rate = failure_rate
+        self.token_ttl = token_ttl
+        self.require_auth = require_auth
+        self.check_owners = check_owners
+        self.modules = list(modules)
+        self.users = users if users is not None else [_user(n, first, last) for n, (first, last) in enumerate(DEFAULT_USERS, 1)]
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.server = None
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.records = {}
+            self.indexes = {}
+            self.access_tokens = {}
+            self.refresh_tokens = set()
+            self.next_id = 5000000000000
+            self.window_start = time.monotonic()
+            self.window_count = 0
+            self.counters = {"requests": 0, "throttled": 0, "unauthorized": 0, "records_written": 0, "records_failed": 0, "tokens_issued": 0}
+
+    # --- tokens -----------------------------------------------------------
+
+    def issue_token(self, refresh_token=None):
+        access_token = f"1000.{secrets.token_hex(16)}"
+        with self.lock:
+            self.access_tokens[access_token] = time.monotonic() + self.token_ttl
+            self.counters["tokens_issued"] += 1
+            if refresh_token is None:
+                refresh_token = f"1000.{secrets.token_hex(16)}"
+                self.refresh_tokens.add(refresh_token)
+        return access_token, refresh_token
+
+    def token_valid(self, access_token):
+        with self.lock:
+            expires_at = self.access_tokens.get(access_token)
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def token_grant(self, form):
+        grant_type = form.get("grant_type")
+        if grant_type == "authorization_code" and form.get("code"):
+            access_token, refresh_token = self.issue_token()
+            return 200, {"access_token": access_token, "refresh_token": refresh_token, "api_domain": "", "token_type": "Bearer", "expires_in": self.token_ttl}
+        if grant_type == "refresh_token":
+            with self.lock:
+                known = form.get("refresh_token") in self.refresh_tokens
+            if known:
+                access_token, _ = self.issue_token(form["refresh_token"])
+                return 200, {"access_token": access_token, "api_domain": "", "token_type": "Bearer", "expires_in": self.token_ttl}
+        return 200, {"error": "invalid_code"}
+
+    # --- throttling -------------------------------------------------------
+
+    def delay(self):
+        seconds = self.latency
+        if self.jitter:
+            with self.lock:
+                seconds += self.random.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def take_credit(self):
+        # Fixed window like Zoho's API credits: rate_limit requests per rate_window seconds.
+        # Returns (allowed, headers) where headers carry the X-RATELIMIT-* view of the window.
+        with self.lock:
+            self.counters["requests"] += 1
+            if not self.rate_limit:
+                return True, {}
+            now = time.monotonic()
+            if now - self.window_start >= self.rate_window:
+                self.window_start = now
+                self.window_count = 0
+            reset = max(0.0, self.rate_window - (now - self.window_start))
+            allowed = self.window_count < self.rate_limit
+            if allowed:
+                self.window_count += 1
+            else:
+                self.counters["throttled"] += 1
+            headers = {
+                "X-RATELIMIT-LIMIT": str(self.rate_limit),
+                "X-RATELIMIT-REMAINING": str(self.rate_limit - self.window_count),
+                "X-RATELIMIT-RESET": f"{reset:.3f}",
+            }
+            if not allowed:
+                headers["Retry-After"] = str(max(1, math.ceil(reset)))
+            return allowed, headers
+
+    # --- records ----------------------------------------------------------
+
+    def record_failure(self, module, record):
+        for field in MANDATORY_FIELDS.get(module, ()):
+            if record.get(field) in (None, ""):
+                return {"code": "MANDATORY_NOT_FOUND", "details": {"api_name": field}, "message": "required field not found", "status": "error"}
+        if self.check_owners:
+            active = {user["id"] for user in self.users}
+            for field in OWNER_FIELDS:
+                owner = record.get(field)
+                owner = owner.get("id") if isinstance(owner, dict) else owner
+                if str(owner or "").isdigit() and str(owner) not in active:
+                    return {"code": "INVALID_DATA", "details": {"expected_data_type": "lookup", "api_name": field}, "message": "invalid data", "status": "error"}
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            field = next(iter(record), "id")
+            return {"code": "INVALID_DATA", "details": {"api_name": field}, "message": "invalid data", "status": "error"}
+        return None
+
+    def _index(self, module, field):
+        # value -> record id for one upsert match field, built on first use and kept current.
+        index = self.indexes.get((module, field))
+        if index is None:
+            index = {_match_key(saved.get(field)): record_id for record_id, saved in self.records.get(module, {}).items()}
+            index.pop(None, None)
+            self.indexes[(module, field)] = index
+        return index
+
+    def _reindex(self, module, saved):
+        for (indexed_module, field), index in self.indexes.items():
+            if indexed_module == module and _match_key(saved.get(field)) is not None:
+                index[saved[field]] = saved["id"]
+
+    def write(self, module, records, upsert=False, duplicate_check_fields=()):
+        results = []
+        with self.lock:
+            if module not in self.modules:
+                self.modules.append(module)
+            stored = self.records.setdefault(module, {})
+            for record in records:
+                failure = self.record_failure(module, record)
+                if failure:
+                    self.counters["records_failed"] += 1
+                    results.append(failure)
+                    continue
+                existing = None
+                if upsert:
+                    for field in duplicate_check_fields:
+                        value = _match_key(record.get(field))
+                        if value is not None and value in self._index(module, field):
+                            existing = stored[self._index(module, field)[value]]
+                            break
+                if existing:
+                    existing.update(record)
+                    existing["Modified_Time"] = time.strftime("%Y-%m-%dT%H:%M:%S+05:30")
+                    record_id, action, message = existing["id"], "update", "record updated"
+                else:
+                    record_id = str(self.next_id)
+                    self.next_id += 1
+                    now = time.strftime("%Y-%m-%dT%H:%M:%S+05:30")
+                    stored[record_id] = {**record, "id": record_id, "Created_Time": now, "Modified_Time": now}
+                    action, message = "insert", "record added"
+                self._reindex(module, stored[record_id])
+                self.counters["records_written"] += 1
+                result = {"code": "SUCCESS", "details": {"id": record_id, "Created_Time": stored[record_id]["Created_Time"]}, "message": message, "status": "success"}
+                if upsert:
+                    result["action"] = action
+                results.append(result)
+        return results
+
+    def get_record(self, module, record_id):
+        with self.lock:
+            record = self.records.get(module, {}).get(record_id)
+            return dict(record) if record else None
+
+    def stats(self):
+        with self.lock:
+            return {**self.counters, "records": {module: len(stored) for module, stored in self.records.items()}}
+
+    # --- server -----------------------------------------------------------
+
+    def start(self, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), FakeZohoHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        threading.Thread(target=self.server.serve_forever, name="fake-zoho", daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        return {
+            "API_BASE_URL": f"{self.base_url}/crm/v2",
+            "TOKEN_URL": f"{self.base_url}/oauth/v2/token",
+        }
+
+
+class FakeZohoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def fake(self):
+        return self.server.fake
+
+    def _send(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _crm_call(self):
+        # Shared prologue for /crm/v2 calls: latency, rate limit, then auth.
+        # Returns the X-RATELIMIT-* headers to send, or None when a response was already sent.
+        self.fake.delay()
+        allowed, headers = self.fake.take_credit()
+        if not allowed:
+            self._send(429, {"code": "TOO_MANY_REQUESTS", "details": {}, "message": "API call limit exceeded", "status": "error"}, headers)
+            return None
+        if self.fake.require_auth:
+            token = (self.headers.get("Authorization") or "").replace("Zoho-oauthtoken", "", 1).strip()
+            if not self.fake.token_valid(token):
+                with self.fake.lock:
+                    self.fake.counters["unauthorized"] += 1
+                self._send(401, {"code": "INVALID_TOKEN", "details": {}, "message": "invalid oauth token", "status": "error"}, headers)
+                return None
+        return headers
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["__stats"]:
+            return self._send(200, self.fake.stats())
+        if parts[:2] != ["crm", "v2"]:
+            return self._send(404, {"code": "INVALID_URL_PATTERN", "status": "error"})
+        headers = self._crm_call()
+        if headers is None:
+            return
+        parts = parts[2:]
+        if parts == ["settings", "modules"]:
+            with self.fake.lock:
+                modules = [{"api_name": name, "module_name": name, "api_supported": True} for name in self.fake.modules]
+            return self._send(200, {"modules": modules}, headers)
+        if parts == ["users"]:
+            query = parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["200"])[0])
+            users = self.fake.users[(page - 1) * per_page:page * per_page]
+            if not users:
+                return self._send(204, headers=headers)
+            more = page * per_page < len(self.fake.users)
+            return self._send(200, {"users": users, "info": {"page": page, "per_page": per_page, "count": len(users), "more_records": more}}, headers)
+        if len(parts) == 2:
+            record = self.fake.get_record(parts[0], parts[1])
+            if record is None:
+                return self._send(204, headers=headers)
+            return self._send(200, {"data": [record]}, headers)
+        self._send(404, {"code": "INVALID_URL_PATTERN", "status": "error"}, headers)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        body = self._body()
+        if parts == ["oauth", "v2", "token"]:
+            self.fake.delay()
+            form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+            form.update({key: values[0] for key, values in parse_qs(url.query).items()})
+            status, payload = self.fake.token_grant(form)
+            return self._send(status, payload)
+        if parts == ["__reset"]:
+            self.fake.reset()
+            return self._send(200, {"status": "success"})
+        if parts[:2] != ["crm", "v2"] or len(parts) not in (3, 4) or (len(parts) == 4 and parts[3] != "upsert"):
+            return self._send(404, {"code": "INVALID_URL_PATTERN", "status": "error"})
+        headers = self._crm_call()
+        if headers is None:
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._send(400, {"code": "INVALID_DATA", "details": {}, "message": "body is not valid JSON", "status": "error"}, headers)
+        records = payload.get("data") or []
+        if not records:
+            return self._send(400, {"code": "REQUIRED_PARAM_MISSING", "details": {"param": "data"}, "message": "data is missing", "status": "error"}, headers)
+        if len(records) > MAX_RECORDS_PER_CALL:
+            return self._send(400, {"code": "LIMIT_EXCEEDED", "details": {"limit": MAX_RECORDS_PER_CALL}, "message": "more than 100 records", "status": "error"}, headers)
+        upsert = len(parts) == 4
+        results = self.fake.write(parts[2], records, upsert, payload.get("duplicate_check_fields") or ())
+        # Zoho answers 201 (insert) / 200 (upsert) when any record went through and 400 when all failed.
+        if not any(result["status"] == "success" for result in results):
+            status = 400
+        else:
+            status = 200 if upsert else 201
+        self._send(status, {"data": results}, headers)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Zoho CRM stand-in for load and latency testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=0, help="added to every API call")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="uniform +/- jitter on top of --latency-ms")
+    parser.add_argument("--rate-limit", type=int, default=0, help="CRM calls allowed per window before 429 (0 = unlimited)")
+    parser.add_argument("--rate-window", type=float, default=60, help="rate limit window in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of records rejected with INVALID_DATA")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="access token lifetime in seconds")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES), help="modules reported by /settings/modules")
+    parser.add_argument("--no-auth", action="store_true", help="accept any access token")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    fake = FakeZoho(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        failure_rate=args.failure_rate,
+        token_ttl=args.token_ttl,
+        modules=[name.strip() for name in args.modules.split(",") if name.strip()],
+        require_auth=not args.no_auth,
+        seed=args.seed,
+    )
+    fake.start(args.host, args.port)
+    access_token, refresh_token = fake.issue_token()
+    print(f"🧪 Fake Zoho CRM listening on {fake.base_url}")
+    for name, value in fake.env().items():
+        print(f"   {name}={value}")
+    print(f"   access_token={access_token}")
+    print(f"   refresh_token={refresh_token}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
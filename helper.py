@@ -1,65 +1,176 @@
 # Helper.py
 import os
 import re
+import shutil
 import tempfile
-import smtplib
 from datetime import datetime
 from typing import Optional
+from functools import lru_cache
+from collections import Counter
+import numpy as np
 import pandas as pd
 from fuzzywuzzy import fuzz
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
+from io import BytesIO
+from mail_outbox import queue_email, smtp_credentials
 
-def excel_to_json(file_path: str):
+def read_workbook(source, sheet_name: str = None) -> pd.DataFrame:
+    if sheet_name:
+        return pd.read_excel(source, sheet_name=sheet_name)
+    return pd.read_excel(source)
+
+def iter_workbook_chunks(source, chunk_size: int = 5000, sheet_name: str = None):
+    # Streams the sheet through openpyxl's read-only mode so only one chunk of rows is held at a time.
+    from openpyxl import load_workbook
+    workbook = load_workbook(source, read_only=True, data_only=True)
     try:
-        df = pd.read_excel(file_path)
-        records = df.to_dict(orient="records")
-        cleaned_records = []
-        for record in records:
-            cleaned_record = {} 
-            for key, value in record.items():
-                if pd.notna(value):
-                    cleaned_record[key] = value
-            cleaned_records.append(cleaned_record)       
-        if cleaned_records:
-            sample_record = cleaned_records[0]
-            crm_columns = [
-                "Email ID", "Mobile No.", "Date of permit", "Site Address",
-                "Applicant Name", "Nature of Development", "Dwelling Unit Info","Area Name", 
-                "Sales Person", "Lead_Name", "Reference", "Company_Name", "Architect Name", "Planning Permission No.", 
-                "Applicant Address", "Future_Projects", "Creation_Time", 
-                "Which_Brand_Looking_for", "How_Much_Square_Feet"
-            ]
-        return cleaned_records      
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(column) if column is not None else f"Unnamed: {i}" for i, column in enumerate(header)]
+        width = len(columns)
+        chunk = []
+        for row in rows:
+            if row is None or all(value is None for value in row):
+                continue
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
 
+def dataframe_to_records(df: pd.DataFrame):
+    records = df.to_dict(orient="records")
+    cleaned_records = []
+    for record in records:
+        cleaned_record = {} 
+        for key, value in record.items():
+            if pd.notna(value):
+                cleaned_record[key] = value
+        cleaned_records.append(cleaned_record)       
+    return cleaned_records
+
+def excel_to_json(file_path: str):
+    try:
+        return dataframe_to_records(read_workbook(file_path))
     except Exception as e:
         print(f"Error in excel_to_json: {str(e)}")
         return []
 
+class ReportSpool:
+    # Report rows collected across the chunks of a streaming import. Each chunk is pickled to a
+    # temporary directory as it arrives, so only row counts stay in memory; the rows are read
+    # back one chunk at a time when the report workbook is written.
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="import_report_")
+        self.parts = {}
+        self.rows = {}
+
+    def add(self, name: str, df: pd.DataFrame):
+        if df.empty:
+            return
+        path = os.path.join(self.directory, f"{sum(len(parts) for parts in self.parts.values())}.pkl")
+        df.to_pickle(path)
+        self.parts.setdefault(name, []).append(path)
+        self.rows[name] = self.rows.get(name, 0) + len(df)
+
+    def sheet(self, name: str) -> "SpooledSheet":
+        return SpooledSheet(self, name)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class SpooledSheet:
+    # One named report in a ReportSpool. Supports what the report emails use from a DataFrame:
+    # len(), .empty, distinct_values() and excel_attachment().
+
+    def __init__(self, spool: ReportSpool, name: str):
+        self.spool = spool
+        self.name = name
+
+    def __len__(self):
+        return self.spool.rows.get(self.name, 0)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def frames(self):
+        for path in self.spool.parts.get(self.name, []):
+            yield pd.read_pickle(path)
+
+def distinct_values(report, column: str) -> int:
+    if isinstance(report, SpooledSheet):
+        values = set()
+        for df in report.frames():
+            if column in df.columns:
+                values.update(df[column].dropna())
+        return len(values)
+    return report[column].nunique() if column in report.columns else 0
+
+def _excel_cell(value):
+    if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+def _write_spooled_workbook(sheets: dict, buffer):
+    # openpyxl's write-only mode streams each appended row to disk, so a spooled report never
+    # has more than one chunk of rows in memory while the workbook is built.
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    for sheet_name, report in sheets.items():
+        sheet = workbook.create_sheet(sheet_name[:31])
+        header = None
+        for df in (report.frames() if isinstance(report, SpooledSheet) else [report]):
+            if header is None:
+                header = list(df.columns)
+                sheet.append([str(column) for column in header])
+            for row in df.reindex(columns=header).astype(object).itertuples(index=False, name=None):
+                sheet.append([_excel_cell(value) for value in row])
+    workbook.save(buffer)
+
+def excel_attachment(df, filename: str) -> MIMEApplication:
+    return excel_workbook_attachment({"Sheet1": df}, filename)
+
+def excel_workbook_attachment(sheets: dict, filename: str) -> MIMEApplication:
+    buffer = BytesIO()
+    if any(isinstance(report, SpooledSheet) for report in sheets.values()):
+        _write_spooled_workbook(sheets, buffer)
+    else:
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet_name[:31], index=False)
+    attachment = MIMEApplication(buffer.getvalue(), _subtype='vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    attachment.add_header('Content-Disposition', 'attachment', filename=filename)
+    return attachment
+
 def send_unmatched_areas_alert(unmatched_df: pd.DataFrame, original_file_name: str = "input_file.xlsx") -> bool:
     try:
-        sender_mailId = os.getenv("SENDER_MAIL", "riverpearlsolutions@gmail.com")
-        passKey = os.getenv("APP_PASSWORD", "gwvcgbvjvttpvlja")
+        sender_mailId, _ = smtp_credentials()
         recipient_email = os.getenv("RECIPIENT_MAIL")        
-        if not sender_mailId or not passKey:
+        if not sender_mailId:
             print("Error: Email credentials not found")
             return False        
         if unmatched_df.empty:
             print("No unmatched areas to report")
             return True        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx", mode='wb')
-        unmatched_df.to_excel(temp_file.name, index=False)
-        temp_file_path = temp_file.name
-        temp_file.close()        
         attachment_filename = f"Unmatched_Areas_{timestamp}.xlsx"        
         msg = MIMEMultipart()
         msg['From'] = sender_mailId
         msg['To'] = recipient_email
         msg['Subject'] = f"Alert: Unmatched Areas Found"     
         total_unmatched = len(unmatched_df)
-        unique_areas = unmatched_df['Area Name'].nunique() if 'Area Name' in unmatched_df.columns else 0
+        unique_areas = distinct_values(unmatched_df, 'Area Name')
         body = f'''
         <html>
         <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
@@ -111,255 +222,256 @@ def send_unmatched_areas_alert(unmatched_df: pd.DataFrame, original_file_name: s
         </html>
         '''        
         msg.attach(MIMEText(body, 'html'))
-        if os.path.exists(temp_file_path):
-            with open(temp_file_path, 'rb') as f:
-                attachment = MIMEApplication(f.read(), _subtype='vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                attachment.add_header('Content-Disposition', 'attachment', filename=attachment_filename)
-                msg.attach(attachment)
-        else:
-            print(f"Error: Temporary file not found at {temp_file_path}")
-            return False
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender_mailId, passKey)
-            server.sendmail(sender_mailId, recipient_email, msg.as_string())
-        try:
-            os.unlink(temp_file_path)
-        except:
-            pass
-        return True
+        msg.attach(excel_attachment(unmatched_df, attachment_filename))
+        return queue_email(msg, recipient_email)
     except Exception as e:
         print(f"❌ Error in send_unmatched_areas_alert function: {str(e)}")
         return False
 
-def assign_sales_person_to_areas(excel_file_path: str,area_column_name: str = 'Area Name',sales_person_column_name: str = 'Sales Person',sheet_name: str = None,fuzzy_match_threshold: int = 100) -> dict:
-    
-    SALES_PERSON_AREAS = {
-        "Abhishek R G": ["Adambakkam","Alandur", "Alandur Guindy", "Guindy", "Madipakkam", 
-            "Medavakkam", "Nanganallur", "Pallikaranai", "Thalakananchery", 
-            "Thalakkanancheri", "Thalakkananchery", "Thalakkancheri", "Velachery"
-        ],
-        "Jagan": [
-            "Adyar", "Athipattu", "Egmore", "Kottur", "Koyambedu", "koyambedu", 
-            "Koyembedu", "Mogappair", "Mullam", "Naduvakarai", "Naduvankarai", 
-            "Naduvankkarai", "Nekundram", "Nerkundram", "Nolambur", "Nungambakkam", 
-            "Pallipattu", "Part of Thirumangalam", "Periyakudal", "Alwarpet",
-            "Secretariat Colony Kilpauk Chennai.", "Urur", "Vada Agaram", "Vepery","Aminjikarai"
-        ],
-        "Karthik": [
-            "Arumbakkam", "Ayyappanthangal", "Ekkaduthangal", "Goparasanallur", 
-            "Kalikundram", "Kanagam", "Karambakkam", "Kodambakkam", "Kolapakkam", 
-            "Kulamanivakkam", "Madhananthapuram", "Madhandhapuram", "Manapakkam", 
-            "Mangadu-B", "Moulivakkam", "Noombal", "Pammal", "Panaveduthottam", 
-            "Parivakkam", "Porur", "Puliyur", "Saligramam", "Tharapakkam", 
-            "Valasaravakkam", "Virugambakkam", "Voyalanallur-A"
-        ],
-        "Venkatesh": [
-            "Agaramthen", "Anakaputhur", "Chembarambakkam", "Cowl Bazaar", 
-            "Gowrivakkam", "Karapakkam", "Kaspapuram", "Kulathuvancheri", 
-            "Kundrathur", "Kundrathur - A", "Kundrathur - B", "Kundrathur-A", 
-            "Kundrathur-B", "Malayambakkam", "Manancheri", "Mannivakkam", 
-            "Meppedu", "Mudichur", "Mullam", "Nandambakkam", "Nanmangalam", 
-            "Naduveerapattu", "Nedungundram", "Nedunkundram", "Nemilichery", 
-            "Ottiyambakkam", "Palanthandalam", "Pallavaram", "Pallavarm", 
-            "Perumbakkam", "Perungalathur", "Rajakilpakkam", "S.Kulathur", 
-            "Selaiyur", "Sirukalathur", "Tambaram", "Thirumudivakkam", 
-            "Thiruneermalai", "Thiruvancheri", "Vandalur", "Varadarajapuram", 
-            "Varadharajapuram", "Vengaivasal", "Vengambakkam", 
-            "Ward No.C of Tambaram" 
-        ],
-        "Dinakaran": [
-            "Kottivakkam", "Kovilambakkam", "Neelangarai", "Okkiam Thoraipakkam", 
-            "Okkiyam Thoraipakkam", "part of Sholinganallur", "Perungudi", 
-            "Sholinganallur", "Thiiruvanmiyur", "Thiruvanmiyur", "Thoraipakkam"
-        ],
-        "Balachander": [
-            "Agraharammel", "Angadu", "Layon Pullion", "Maduravoyal","Sithalapakkam"
-        ],
-        "Jagan / Balachander": [
-            "Adayalampattu", "Alamathi", "Ambathur", "Ambattur", "Arumandai", 
-            "at Kondakarai Kuruvimedu Panchayat Road and", "at Orakkadu", 
-            "at Puzhal", "Ayanambakkam", "Ayanavaram", "Budur", "BUDUR", 
-            "Chintadripet", "Girudalapuram", "Kannapalayam", "Karanodai", 
-            "Karunakaracheri", "Kathirvedu", "Korattur", "Korattur A", "Kosapur", 
-            "Kovilpadagai", "Layon Grant", "Madhavaram", "Mijur", "Minjur", 
-            "Minjur II", "Nayar-II", "Nemam", "Oragadam", "Orakkadu", "Padi", 
-            "Padiyanallur", "Pakkam", "Palanjur", "Paleripattu", "part of Ayapakkam", 
-            "Paruthipattu", "Perambur", "Peravallur", "Periyamullaivoyal", 
-            "Perungavur", "Peruvallur", "Ponneri", "Purasaiwalkam", "Purasalwalkam", 
-            "Purursawalkkam", "Purusawalkam", "Seemapuram", "Sholavaram", 
-            "Sirugavoor", "Sothuperumbedu", "Thirumanam", "Thirunindravur B", 
-            "Thiruninravur", "Thiruninravur-A", "Thiruninravur-B", "Thiruvotriyur", 
-            "Tondairpet", "Tondiarpet", "Vanagaram", "Vayalanallur", "Vayalanallur-A", 
-            "Veeraragavapuram", "Veeraraghavapuram", "Venkatapuram", 
-            "Vilangadupakkam", "Villivakkam", "Paruthipattu"
-        ],
-        "Karthik / Venkatesh": [
-            "Gerugambakkam", "Kollacheri", "Kulappakkam", "Kuthambakkam", 
-            "Poonamallee", "Rendamkattalai", "Rendankattalai", "Sikkarayapuram", 
-            "Vellavedu", "Zamin Pallavaram", "Zamin Pallvaram", "Mambalam", 
-            "Arasankalani", "Arasankazhani"
-        ],
-        "Jagan / Karthik": [
-            "Mylapore", "T Nagar", "T.Nagar"
-        ],
-        "Venkatesh / Dinikaran": [
-            "Part Kottivakkam", "Semmancheri", "Semmanchery"
-        ],
-    }
-    def normalize_text(text: str) -> str:
-        if pd.isna(text) or text == "":
-            return ""
-        normalized = re.sub(r'[^\w\s]', '', str(text).strip().lower())
-        return re.sub(r'\s+', ' ', normalized)
-    
-    def find_best_match(area_name: str) -> Optional[str]:
-        if pd.isna(area_name) or area_name.strip() == "":
-            return None
-        normalized_area = normalize_text(area_name)
-        for sales_person, areas in SALES_PERSON_AREAS.items():
-            for mapped_area in areas:
-                normalized_mapped = normalize_text(mapped_area)
-                if normalized_area == normalized_mapped:
-                    return sales_person
+SALES_PERSON_AREAS = {
+    "Abhishek R G": ["Adambakkam","Alandur", "Alandur Guindy", "Guindy", "Madipakkam", 
+        "Medavakkam", "Nanganallur", "Pallikaranai", "Thalakananchery", 
+        "Thalakkanancheri", "Thalakkananchery", "Thalakkancheri", "Velachery"
+    ],
+    "Jagan": [
+        "Adyar", "Athipattu", "Egmore", "Kottur", "Koyambedu", "koyambedu", 
+        "Koyembedu", "Mogappair", "Mullam", "Naduvakarai", "Naduvankarai", 
+        "Naduvankkarai", "Nekundram", "Nerkundram", "Nolambur", "Nungambakkam", 
+        "Pallipattu", "Part of Thirumangalam", "Periyakudal", "Alwarpet",
+        "Secretariat Colony Kilpauk Chennai.", "Urur", "Vada Agaram", "Vepery","Aminjikarai"
+    ],
+    "Karthik": [
+        "Arumbakkam", "Ayyappanthangal", "Ekkaduthangal", "Goparasanallur", 
+        "Kalikundram", "Kanagam", "Karambakkam", "Kodambakkam", "Kolapakkam", 
+        "Kulamanivakkam", "Madhananthapuram", "Madhandhapuram", "Manapakkam", 
+        "Mangadu-B", "Moulivakkam", "Noombal", "Pammal", "Panaveduthottam", 
+        "Parivakkam", "Porur", "Puliyur", "Saligramam", "Tharapakkam", 
+        "Valasaravakkam", "Virugambakkam", "Voyalanallur-A"
+    ],
+    "Venkatesh": [
+        "Agaramthen", "Anakaputhur", "Chembarambakkam", "Cowl Bazaar", 
+        "Gowrivakkam", "Karapakkam", "Kaspapuram", "Kulathuvancheri", 
+        "Kundrathur", "Kundrathur - A", "Kundrathur - B", "Kundrathur-A", 
+        "Kundrathur-B", "Malayambakkam", "Manancheri", "Mannivakkam", 
+        "Meppedu", "Mudichur", "Mullam", "Nandambakkam", "Nanmangalam", 
+        "Naduveerapattu", "Nedungundram", "Nedunkundram", "Nemilichery", 
+        "Ottiyambakkam", "Palanthandalam", "Pallavaram", "Pallavarm", 
+        "Perumbakkam", "Perungalathur", "Rajakilpakkam", "S.Kulathur", 
+        "Selaiyur", "Sirukalathur", "Tambaram", "Thirumudivakkam", 
+        "Thiruneermalai", "Thiruvancheri", "Vandalur", "Varadarajapuram", 
+        "Varadharajapuram", "Vengaivasal", "Vengambakkam", 
+        "Ward No.C of Tambaram" 
+    ],
+    "Dinakaran": [
+        "Kottivakkam", "Kovilambakkam", "Neelangarai", "Okkiam Thoraipakkam", 
+        "Okkiyam Thoraipakkam", "part of Sholinganallur", "Perungudi", 
+        "Sholinganallur", "Thiiruvanmiyur", "Thiruvanmiyur", "Thoraipakkam"
+    ],
+    "Balachander": [
+        "Agraharammel", "Angadu", "Layon Pullion", "Maduravoyal","Sithalapakkam"
+    ],
+    "Jagan / Balachander": [
+        "Adayalampattu", "Alamathi", "Ambathur", "Ambattur", "Arumandai", 
+        "at Kondakarai Kuruvimedu Panchayat Road and", "at Orakkadu", 
+        "at Puzhal", "Ayanambakkam", "Ayanavaram", "Budur", "BUDUR", 
+        "Chintadripet", "Girudalapuram", "Kannapalayam", "Karanodai", 
+        "Karunakaracheri", "Kathirvedu", "Korattur", "Korattur A", "Kosapur", 
+        "Kovilpadagai", "Layon Grant", "Madhavaram", "Mijur", "Minjur", 
+        "Minjur II", "Nayar-II", "Nemam", "Oragadam", "Orakkadu", "Padi", 
+        "Padiyanallur", "Pakkam", "Palanjur", "Paleripattu", "part of Ayapakkam", 
+        "Paruthipattu", "Perambur", "Peravallur", "Periyamullaivoyal", 
+        "Perungavur", "Peruvallur", "Ponneri", "Purasaiwalkam", "Purasalwalkam", 
+        "Purursawalkkam", "Purusawalkam", "Seemapuram", "Sholavaram", 
+        "Sirugavoor", "Sothuperumbedu", "Thirumanam", "Thirunindravur B", 
+        "Thiruninravur", "Thiruninravur-A", "Thiruninravur-B", "Thiruvotriyur", 
+        "Tondairpet", "Tondiarpet", "Vanagaram", "Vayalanallur", "Vayalanallur-A", 
+        "Veeraragavapuram", "Veeraraghavapuram", "Venkatapuram", 
+        "Vilangadupakkam", "Villivakkam", "Paruthipattu"
+    ],
+    "Karthik / Venkatesh": [
+        "Gerugambakkam", "Kollacheri", "Kulappakkam", "Kuthambakkam", 
+        "Poonamallee", "Rendamkattalai", "Rendankattalai", "Sikkarayapuram", 
+        "Vellavedu", "Zamin Pallavaram", "Zamin Pallvaram", "Mambalam", 
+        "Arasankalani", "Arasankazhani"
+    ],
+    "Jagan / Karthik": [
+        "Mylapore", "T Nagar", "T.Nagar"
+    ],
+    "Venkatesh / Dinikaran": [
+        "Part Kottivakkam", "Semmancheri", "Semmanchery"
+    ],
+}
+
+def normalize_text(text: str) -> str:
+    if pd.isna(text) or text == "":
+        return ""
+    normalized = re.sub(r'[^\w\s]', '', str(text).strip().lower())
+    return re.sub(r'\s+', ' ', normalized)
+
+def normalize_area_series(areas: pd.Series) -> pd.Series:
+    normalized = areas.where(areas.notna(), "").astype(str).str.strip().str.lower()
+    normalized = normalized.str.replace(r'[^\w\s]', '', regex=True)
+    return normalized.str.replace(r'\s+', ' ', regex=True)
+
+def build_area_index(sales_person_areas: dict) -> dict:
+    # First mapping wins, matching the order the nested lookup used to scan the table in.
+    area_index = {}
+    for sales_person, areas in sales_person_areas.items():
+        for area in areas:
+            normalized = normalize_text(area)
+            if normalized:
+                area_index.setdefault(normalized, sales_person)
+    return area_index
+
+AREA_INDEX = build_area_index(SALES_PERSON_AREAS)
+
+def area_ngrams(text: str, n: int = 3) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+def build_ngram_index(area_index: dict) -> dict:
+    ngram_index = {}
+    for normalized in area_index:
+        for gram in area_ngrams(normalized):
+            ngram_index.setdefault(gram, []).append(normalized)
+    return ngram_index
+
+AREA_NGRAM_INDEX = build_ngram_index(AREA_INDEX)
+
+@lru_cache(maxsize=8192)
+def fuzzy_match_area(normalized_area: str, threshold: int, max_candidates: int = 10) -> Optional[str]:
+    # Only mapped areas sharing the most trigrams with the input are scored, never the whole table.
+    if not normalized_area:
         return None
+    shared_grams = Counter()
+    for gram in area_ngrams(normalized_area):
+        shared_grams.update(AREA_NGRAM_INDEX.get(gram, ()))
+    best_area, best_score = None, -1
+    for candidate, _ in shared_grams.most_common(max_candidates):
+        score = fuzz.ratio(normalized_area, candidate)
+        if score >= threshold and score > best_score:
+            best_area, best_score = candidate, score
+    return AREA_INDEX[best_area] if best_area else None
+
+def lookup_sales_persons(areas: pd.Series, fuzzy_match_threshold: int = 100) -> pd.Series:
+    normalized = normalize_area_series(areas)
+    sales_persons = normalized.map(AREA_INDEX).astype(object)
+    if fuzzy_match_threshold < 100:
+        missing = sales_persons.isna() & (normalized != "")
+        if missing.any():
+            fuzzy_matches = {area: fuzzy_match_area(area, fuzzy_match_threshold) for area in normalized[missing].unique()}
+            sales_persons[missing] = normalized[missing].map(fuzzy_matches)
+            matched = sum(1 for sales_person in fuzzy_matches.values() if sales_person)
+            print(f"  - Fuzzy matched {matched} of {len(fuzzy_matches)} distinct unmatched areas (threshold {fuzzy_match_threshold})")
+    return sales_persons
+
+def split_shared_assignments(df: pd.DataFrame, sales_col: str, mode: str = "block") -> pd.DataFrame:
+    # Shared territories ("Jagan / Balachander") are split across their salespeople either in
+    # contiguous blocks (first person gets the first rows, remainder goes to the earliest people)
+    # or round-robin. Unshared rows come first, then each shared group in order of first appearance.
+    if mode not in ("block", "round_robin"):
+        raise ValueError(f"Unknown split mode: {mode}")
+    shared_mask = df[sales_col].str.contains('/', na=False)
+    if not shared_mask.any():
+        return df
+    shared_df = df[shared_mask]
+    keys = shared_df[sales_col].str.replace(r'\s*/\s*', ' / ', regex=True).str.strip()
+    codes, shared_keys = pd.factorize(keys)
+    salespeople = [np.array(key.split(' / '), dtype=object) for key in shared_keys]
+    positions = shared_df.groupby(codes, sort=False).cumcount().to_numpy()
+    group_sizes = np.bincount(codes)[codes]
+    people_counts = np.array([len(people) for people in salespeople])[codes]
+    if mode == "round_robin":
+        person_idx = positions % people_counts
+    else:
+        per_person = group_sizes // people_counts
+        remainder = group_sizes % people_counts
+        larger_rows = remainder * (per_person + 1)
+        person_idx = np.where(
+            positions < larger_rows,
+            positions // (per_person + 1),
+            remainder + (positions - larger_rows) // np.maximum(per_person, 1),
+        )
+    assigned = np.empty(len(shared_df), dtype=object)
+    for code, people in enumerate(salespeople):
+        in_group = codes == code
+        assigned[in_group] = people[person_idx[in_group]]
+    order = np.argsort(codes, kind="stable")
+    split_df = shared_df.iloc[order].copy()
+    split_df[sales_col] = assigned[order]
+    return pd.concat([df[~shared_mask], split_df]).reset_index(drop=True)
+
+def split_by_assignment(df: pd.DataFrame,area_column_name: str = 'Area Name',sales_person_column_name: str = 'Sales Person',fuzzy_match_threshold: int = 100,split_mode: str = "block"):
+    if area_column_name not in df.columns:
+        available_columns = list(df.columns)
+        raise ValueError(f"Column '{area_column_name}' not found. Available columns: {available_columns}")
+    result_df = df.copy()
+    result_df[sales_person_column_name] = lookup_sales_persons(result_df[area_column_name], fuzzy_match_threshold)
+    result_df = split_shared_assignments(result_df, sales_person_column_name, split_mode)
+    matched_df = result_df[result_df[sales_person_column_name].notna()].copy()
+    unmatched_df = result_df[result_df[sales_person_column_name].isna()].copy()
+    matched_count = len(matched_df)
+    unmatched_count = len(unmatched_df)        
+    print(f"\n✅ Assignment completed:")
+    print(f"  - Matched areas: {matched_count}")
+    print(f"  - Unmatched areas: {unmatched_count}")
     
-    def split_shared_assignments(df: pd.DataFrame, sales_col: str) -> pd.DataFrame:
-        shared_mask = df[sales_col].str.contains('/', na=False)
-        if not shared_mask.any():
-            return df
-        result_rows = []
-        for idx, row in df.iterrows():
-            sales_person = row[sales_col]
-            if pd.isna(sales_person) or '/' not in sales_person:
-                result_rows.append(row)
-            else:
-                salespeople = [sp.strip() for sp in sales_person.split('/')]
-                result_rows.append({
-                    'row': row,
-                    'salespeople': salespeople,
-                    'is_shared': True
-                })
-        final_rows = []
-        shared_groups = {}
-        for item in result_rows:
-            if isinstance(item, dict) and item.get('is_shared'):
-                key = ' / '.join(item['salespeople'])
-                if key not in shared_groups:
-                    shared_groups[key] = []
-                shared_groups[key].append(item['row'])
-            else:
-                final_rows.append(item)
-        for shared_key, rows in shared_groups.items():
-            salespeople = shared_key.split(' / ')
-            num_salespeople = len(salespeople)
-            num_records = len(rows)
-            if num_records == 1:
-                row_copy = rows[0].copy()
-                row_copy[sales_col] = salespeople[0]
-                final_rows.append(row_copy)
-            else:
-                records_per_person = num_records // num_salespeople
-                remainder = num_records % num_salespeople
-                start_idx = 0
-                for i, salesperson in enumerate(salespeople):
-                    count = records_per_person + (1 if i < remainder else 0)
-                    end_idx = start_idx + count
-                    
-                    for row in rows[start_idx:end_idx]:
-                        row_copy = row.copy()
-                        row_copy[sales_col] = salesperson
-                        final_rows.append(row_copy)
-                    start_idx = end_idx
-        return pd.DataFrame(final_rows).reset_index(drop=True)
+    if matched_count > 0:
+        distribution = matched_df[sales_person_column_name].value_counts()
+        for sp, count in distribution.items():
+            print(f"  - {sp}: {count}")
+    return matched_df, unmatched_df
+
+def send_assignment_report(unmatched_df: pd.DataFrame, original_file_name: str) -> bool:
+    if unmatched_df.empty:
+        print("\n✅ All areas matched successfully! No unmatched records.")
+        return True
+    alert_sent = send_unmatched_areas_alert(unmatched_df, original_file_name)
+    if alert_sent:
+        print(f"📮 Alert email queued for {os.getenv('RECIPIENT_MAIL')}")
+    else:
+        print("⚠️ Failed to send alert email")
+    return alert_sent
+
+def assign_sales_person_df(df: pd.DataFrame,area_column_name: str = 'Area Name',sales_person_column_name: str = 'Sales Person',fuzzy_match_threshold: int = 100,original_file_name: str = "input_file.xlsx",send_email: bool = True,split_mode: str = "block") -> pd.DataFrame:
+    matched_df, unmatched_df = split_by_assignment(df, area_column_name, sales_person_column_name, fuzzy_match_threshold, split_mode)
+    if send_email:
+        send_assignment_report(unmatched_df, original_file_name)
+    return matched_df
+
+def assign_sales_person_to_areas(excel_file_path: str,area_column_name: str = 'Area Name',sales_person_column_name: str = 'Sales Person',sheet_name: str = None,fuzzy_match_threshold: int = 100) -> dict:
     try:
-        if sheet_name:
-            df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
-        else:
-            df = pd.read_excel(excel_file_path)
-        if area_column_name not in df.columns:
-            available_columns = list(df.columns)
-            raise ValueError(f"Column '{area_column_name}' not found. Available columns: {available_columns}")
-        result_df = df.copy()
-        result_df[sales_person_column_name] = result_df[area_column_name].apply(find_best_match)
-        result_df = split_shared_assignments(result_df, sales_person_column_name)
-        matched_df = result_df[result_df[sales_person_column_name].notna()].copy()
-        unmatched_df = result_df[result_df[sales_person_column_name].isna()].copy()
-        matched_count = len(matched_df)
-        unmatched_count = len(unmatched_df)        
-        print(f"\n✅ Assignment completed:")
-        print(f"  - Matched areas: {matched_count}")
-        print(f"  - Unmatched areas: {unmatched_count}")
-        
-        if matched_count > 0:
-            distribution = matched_df[sales_person_column_name].value_counts()
-            for sp, count in distribution.items():
-                print(f"  - {sp}: {count}")
-        
+        df = read_workbook(excel_file_path, sheet_name)
+        matched_df = assign_sales_person_df(df, area_column_name, sales_person_column_name, fuzzy_match_threshold, os.path.basename(excel_file_path))
         matched_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
         matched_df.to_excel(matched_temp_file.name, index=False)
         matched_file_path = matched_temp_file.name
         matched_temp_file.close()        
-        unmatched_file_path = None
-        if unmatched_count > 0:
-            unmatched_areas = unmatched_df[area_column_name].unique()
-            unmatched_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-            unmatched_df.to_excel(unmatched_temp_file.name, index=False)
-            unmatched_file_path = unmatched_temp_file.name
-            unmatched_temp_file.close()
-            original_filename = os.path.basename(excel_file_path)
-            alert_sent = send_unmatched_areas_alert(unmatched_df, original_filename)
-            if alert_sent:
-                print(f"✅ Alert email sent successfully to {os.getenv('RECIPIENT_MAIL')}")
-            else:
-                print("⚠️ Failed to send alert email")
-        else:
-            print("\n✅ All areas matched successfully! No unmatched records.")
-
-        print('matched_file', matched_file_path,'\nunmatched_file',unmatched_file_path,)
+        print('matched_file', matched_file_path)
         return matched_file_path        
     except Exception as e:
         print(f"❌ Error processing Excel file: {str(e)}")
         raise e
     
-def send_records_alert(matched_df: pd.DataFrame, unmatched_df: pd.DataFrame, original_file_name: str = "input_file.xlsx") -> bool:
+def send_records_alert(matched_df: pd.DataFrame, unmatched_df: pd.DataFrame, original_file_name: str = "input_file.xlsx", matched_count: int = None) -> bool:
     try:
-        sender_mailId = os.getenv("SENDER_MAIL", "riverpearlsolutions@gmail.com")
-        passKey = os.getenv("APP_PASSWORD", "gwvcgbvjvttpvlja")
+        sender_mailId, _ = smtp_credentials()
         recipient_email = os.getenv("RECIPIENT_MAIL")        
-        if not sender_mailId or not passKey:
+        if not sender_mailId:
             print("Error: Email credentials not found")
             return False        
         if not recipient_email:
             print("Error: Recipient email not found")
             return False        
-        if matched_df.empty and unmatched_df.empty:
+        if matched_df.empty and unmatched_df.empty and not matched_count:
             print("No records to report")
             return True        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")        
-        temp_files = []        
-        if not matched_df.empty:
-            matched_temp = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx", mode='wb')
-            matched_df.to_excel(matched_temp.name, index=False)
-            matched_temp.close()
-            temp_files.append({
-                'path': matched_temp.name,
-                'filename': f"Matched_Records_{timestamp}.xlsx",
-                'type': 'matched'
-            })        
-        if not unmatched_df.empty:
-            unmatched_temp = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx", mode='wb')
-            unmatched_df.to_excel(unmatched_temp.name, index=False)
-            unmatched_temp.close()
-            temp_files.append({
-                'path': unmatched_temp.name,
-                'filename': f"Unmatched_Records_{timestamp}.xlsx",
-                'type': 'unmatched'
-            })        
         msg = MIMEMultipart()
         msg['From'] = sender_mailId
         msg['To'] = recipient_email
         msg['Subject'] = f"Records Report: Matched & Unmatched - {original_file_name}"
-        total_matched = len(matched_df)
+        total_matched = len(matched_df) if matched_count is None else matched_count
         total_unmatched = len(unmatched_df)
         total_records = total_matched + total_unmatched        
         body = f'''
@@ -414,7 +526,7 @@ def send_records_alert(matched_df: pd.DataFrame, unmatched_df: pd.DataFrame, ori
                     <div style="background-color: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0;">
                         <h4 style="margin-top: 0; color: #004085;">📎 Attachments:</h4>
                         <ul style="margin: 5px 0;">
-                            {'<li>✅ <strong>Matched_Records.xlsx</strong> - Contains all matched records</li>' if total_matched > 0 else ''}
+                            {'<li>✅ <strong>Matched_Records.xlsx</strong> - Contains all matched records</li>' if not matched_df.empty else ''}
                             {'<li>⚠️ <strong>Unmatched_Records.xlsx</strong> - Contains all unmatched records</li>' if total_unmatched > 0 else ''}
                         </ul>
                     </div>
@@ -448,77 +560,179 @@ def send_records_alert(matched_df: pd.DataFrame, unmatched_df: pd.DataFrame, ori
         '''
         
         msg.attach(MIMEText(body, 'html'))        
-        for file_info in temp_files:
-            if os.path.exists(file_info['path']):
-                with open(file_info['path'], 'rb') as f:
-                    attachment = MIMEApplication(f.read(), _subtype='vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                    attachment.add_header('Content-Disposition', 'attachment', filename=file_info['filename'])
-                    msg.attach(attachment)
-            else:
-                print(f"Warning: File not found at {file_info['path']}")        
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender_mailId, passKey)
-            server.sendmail(sender_mailId, recipient_email, msg.as_string())
-        print(f"✅ Email report sent successfully to {recipient_email}")
+        if not matched_df.empty:
+            msg.attach(excel_attachment(matched_df, f"Matched_Records_{timestamp}.xlsx"))
+        if not unmatched_df.empty:
+            msg.attach(excel_attachment(unmatched_df, f"Unmatched_Records_{timestamp}.xlsx"))
+        queued = queue_email(msg, recipient_email)
+        print(f"📮 Email report queued for {recipient_email}")
         print(f"   - Matched records: {total_matched}")
         print(f"   - Unmatched records: {total_unmatched}")        
-        for file_info in temp_files:
-            try:
-                os.unlink(file_info['path'])
-            except:
-                pass
-        return True
+        return queued
     except Exception as e:
         print(f"❌ Error in send_records_alert function: {str(e)}")
         return False
 
+DEVELOPMENT_KEYWORDS = ["premium fsi","units","mall","theatre building","screens","dwelling units","dwellings","school building", "hospital", "college", "inst", "kalyana mandapam","auditorium","service apartment","service apartments"]
+
+def development_keywords() -> list:
+    configured = os.getenv("DEVELOPMENT_KEYWORDS")
+    if configured:
+        return [keyword.strip().lower() for keyword in configured.split(",") if keyword.strip()]
+    return DEVELOPMENT_KEYWORDS
+
+@lru_cache(maxsize=32)
+def compile_keyword_pattern(keywords: tuple):
+    # One alternation over the lower-cased keywords; callers search lower-cased text, which is
+    # several times faster than re.IGNORECASE. Longer keywords come first so "dwelling units"
+    # is reported rather than "units" when both start at the same place.
+    alternatives = sorted(dict.fromkeys(keyword.lower() for keyword in keywords if keyword), key=len, reverse=True)
+    return re.compile("|".join(re.escape(keyword) for keyword in alternatives)) if alternatives else None
+
+def filter_development_records(df: pd.DataFrame, keywords: list = None):
+    # matched_df gets a "Matched Keyword" column: the first keyword found in the Nature of
+    # Development text, or None for rows kept because they have a dwelling count.
+    required_cols = ["Dwelling Unit Info", "Nature of Development"]
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"Missing required column: {col}")        
+    pattern = compile_keyword_pattern(tuple(keywords or development_keywords()))
+    dwelling = df["Dwelling Unit Info"]
+    has_dwelling = dwelling.notna() & (dwelling.astype(str).str.strip() != "")
+    # Only rows without a dwelling count need the keyword scan, and Nature of Development
+    # texts repeat a lot, so each distinct text is searched once and mapped back to its rows.
+    nature = df.loc[~has_dwelling, "Nature of Development"].astype(str)
+    codes, texts = pd.factorize(nature)
+    searches = [pattern.search(text.lower()) if pattern else None for text in texts]
+    # Trailing None: factorize codes missing texts as -1.
+    text_keywords = np.array([found.group(0) if found else None for found in searches] + [None], dtype=object)
+    matched_keyword = pd.Series(text_keywords[codes], index=nature.index, dtype=object).reindex(df.index)
+    matched_mask = has_dwelling | matched_keyword.notna()
+    matched_df = df[matched_mask].assign(**{"Matched Keyword": matched_keyword[matched_mask]})
+    unmatched_df = df[~matched_mask]
+    print(f"   Total matched records: {len(matched_df)}")        
+    print(f"   Total unmatched records: {len(unmatched_df)}")        
+    return matched_df, unmatched_df
+
+def send_filter_report(matched_df: pd.DataFrame, unmatched_df: pd.DataFrame, original_file_name: str, matched_count: int = None) -> bool:
+    print("\n📧 Sending email report with matched and unmatched records...")
+    email_sent = send_records_alert(matched_df, unmatched_df, original_file_name, matched_count)
+    if email_sent:
+        print("📮 Email report queued!")
+    else:
+        print("⚠️ Failed to send email report")
+    return email_sent
+
+def digest_reports_enabled() -> bool:
+    return os.getenv("REPORT_EMAIL_MODE", "digest").strip().lower() == "digest"
+
+def send_run_digest(original_file_name: str, sheets: dict, summary: dict) -> bool:
+    # One email per import: every stage report goes into a single workbook, one sheet each,
+    # with a Summary sheet of the per-stage counts in front.
+    try:
+        sender_mailId, _ = smtp_credentials()
+        recipient_email = os.getenv("RECIPIENT_MAIL")
+        if not recipient_email:
+            print("Error: Recipient email not found")
+            return False
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        summary_rows = [{"Stage": stage, "Metric": metric, "Value": value} for stage, metrics in summary.items() for metric, value in metrics.items()]
+        workbook = {"Summary": pd.DataFrame(summary_rows, columns=["Stage", "Metric", "Value"])}
+        workbook.update({name: df for name, df in sheets.items() if df is not None and not df.empty})
+        msg = MIMEMultipart()
+        msg['From'] = sender_mailId
+        msg['To'] = recipient_email
+        msg['Subject'] = f"Import Report - {original_file_name}"
+        stage_items = "".join(
+            f"<li><strong>{stage}:</strong> " + ", ".join(f"{metric} {value}" for metric, value in metrics.items()) + "</li>"
+            for stage, metrics in summary.items()
+        )
+        sheet_items = "".join(f"<li>📄 <strong>{name}</strong> - {len(df)} rows</li>" for name, df in workbook.items() if name != "Summary")
+        body = f'''
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 650px; margin: 0 auto; padding: 20px;">
+                <div style="background-color: #4a90e2; color: white; padding: 15px; border-radius: 5px;">
+                    <h2 style="margin: 0;">📊 Import Run Report</h2>
+                </div>
+                
+                <div style="padding: 20px; background-color: #f9f9f9; margin-top: 20px; border-radius: 5px;">
+                    <p>Dear Team,</p>
+                    <p>The system {"stopped with an error while processing" if "Error" in summary else "has completed processing"} <strong>{original_file_name}</strong>. Every stage report for this run is in the attached workbook.</p>
+                    
+                    <div style="background-color: white; padding: 15px; border-left: 4px solid #4a90e2; margin: 20px 0;">
+                        <h3 style="margin-top: 0; color: #4a90e2;">Run Summary</h3>
+                        <ul style="list-style: none; padding: 0;">
+                            <li>📁 <strong>Source File:</strong> {original_file_name}</li>
+                            <li>📅 <strong>Generated On:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</li>
+                            {stage_items}
+                        </ul>
+                    </div>
+                    
+                    <div style="background-color: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                        <h4 style="margin-top: 0; color: #004085;">📎 Import_Report_{timestamp}.xlsx</h4>
+                        <ul style="margin: 5px 0;">
+                            <li>📄 <strong>Summary</strong> - counts per stage</li>
+                            {sheet_items}
+                        </ul>
+                    </div>
+                </div>
+                
+                <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
+                
+                <div style="font-size: 12px; color: #666;">
+                    <p><strong>VPEARL SOLUTIONS - An AI Company, Chennai</strong></p>
+                    <p>
+                        🌐 <a href="https://vpearlsolutions.com/" target="_blank" style="color: #4a90e2;">Website</a> | 
+                        🔗 <a href="https://www.linkedin.com/company/vpealsoutions/" target="_blank" style="color: #4a90e2;">LinkedIn</a> | 
+                        📷 <a href="https://www.instagram.com/vpearl_solutions" target="_blank" style="color: #4a90e2;">Instagram</a> | 
+                        📘 <a href="https://www.facebook.com/profile.php?id=61572978223085" target="_blank" style="color: #4a90e2;">Facebook</a>
+                    </p>
+                    <p style="font-size: 10px; color: #999;">
+                        <em>This is an automated report. Please do not reply to this email.</em>
+                    </p>
+                </div>
+            </div>
+        </body>
+        </html>
+        '''
+        msg.attach(MIMEText(body, 'html'))
+        msg.attach(excel_workbook_attachment(workbook, f"Import_Report_{timestamp}.xlsx"))
+        queued = queue_email(msg, recipient_email)
+        print(f"📮 Run report queued for {recipient_email} ({len(workbook)} sheets)")
+        return queued
+    except Exception as e:
+        print(f"❌ Error in send_run_digest function: {str(e)}")
+        return False
+
 def separate_and_store_temp(filepath, send_email=True):
-    keywords = ["premium fsi","units","mall","theatre building","screens","dwelling units","dwellings","school building", "hospital", "college", "inst", "kalyana mandapam","auditorium","service apartment","service apartments"]
     try:
-        df = pd.read_excel(filepath)
-        original_file_name = os.path.basename(filepath)
-        required_cols = ["Dwelling Unit Info", "Nature of Development"]
-        for col in required_cols:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: {col}")        
-        cond1 = df["Dwelling Unit Info"].notna() & (df["Dwelling Unit Info"].astype(str).str.strip() != "")                
-        nature_lower = df["Nature of Development"].astype(str).str.lower().str.strip()
-        cond2 = df["Dwelling Unit Info"].isna() | (df["Dwelling Unit Info"].astype(str).str.strip() == "")
-        cond2 = cond2 & nature_lower.apply(lambda x: any(k in x for k in keywords))
-        matched_df = df[cond1 | cond2]
-        unmatched_df = df[~(cond1 | cond2)]        
+        df = read_workbook(filepath)
+        matched_df, unmatched_df = filter_development_records(df)
         matched_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix="_matched.xlsx")
         matched_df.to_excel(matched_temp_file.name, index=False)
         print(f"✅ Matched data saved to: {matched_temp_file.name}")
-        print(f"   Total matched records: {len(matched_df)}")        
-        unmatched_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix="_unmatched.xlsx")
-        unmatched_df.to_excel(unmatched_temp_file.name, index=False)
-        print(f"✅ Unmatched data saved to: {unmatched_temp_file.name}")
-        print(f"   Total unmatched records: {len(unmatched_df)}")        
         if send_email:
-            print("\n📧 Sending email report with matched and unmatched records...")
-            email_sent = send_records_alert(matched_df, unmatched_df, original_file_name)
-            if email_sent:
-                print("✅ Email report sent successfully!")
-            else:
-                print("⚠️ Failed to send email report")
+            send_filter_report(matched_df, unmatched_df, os.path.basename(filepath))
         return matched_temp_file.name
     except Exception as e:
         print(f"❌ Error: {e}")
         return None
     
-def assgin_leads_to_lead_name(file_path, zoho_auth):
+def create_leads_from_dataframe(df: pd.DataFrame, zoho_auth, batch_size=100, fetch_details=False):
+    print("Creating Leads from CMDA records...")
+    results = zoho_auth.create_leads_from_cmda_records(df, batch_size=batch_size, fetch_details=fetch_details)
+    leads_created = sum(1 for result in results if result["status"] == "success")
+    leads_unchanged = sum(1 for result in results if result["status"] == "skipped")
+    print(f"\n🎯 Final Results:")
+    print(f"   - CMDA Records Pushed: {len(df)}")
+    print(f"   - Leads Created: {leads_created}")        
+    print(f"   - Leads Unchanged Since Last Import: {leads_unchanged}")
+    return results
+
+def assgin_leads_to_lead_name(file_path, zoho_auth, batch_size=100, fetch_details=False):
     try:                       
-        df = pd.read_excel(file_path)
-        records = df.to_dict('records')
-        print("Creating Leads from CMDA records...")
-        leads_created = 0
-        for record in records:
-            if zoho_auth.create_lead_from_cmda_record(record):
-                leads_created += 1        
-        print(f"\n🎯 Final Results:")
-        print(f"   - CMDA Records Pushed: {len(records)}")
-        print(f"   - Leads Created: {leads_created}")        
+        create_leads_from_dataframe(read_workbook(file_path), zoho_auth, batch_size, fetch_details)
         try:
             os.unlink(file_path)
         except:
@@ -526,4 +740,4 @@ def assgin_leads_to_lead_name(file_path, zoho_auth):
         return True
     except Exception as e:
         print(f"❌ Error in process_and_push_to_zoho: {e}")
-        return False
\ No newline at end of file
+        return False
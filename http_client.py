@@ -0,0 +1,156 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limiter import get_rate_limiter
+
+# One pooled, keep-alive session shared by every Zoho call in the process.
+# Pool size and timeouts come from the environment; a custom transport
+# (any requests adapter) can be mounted to point the client at a local stand-in.
+# Every request goes through the shared rate limiter and 429/5xx responses are
+# retried with jittered exponential backoff. Inserts are only replayed on 429 and
+# 503, which mean Zoho did not process them; any other 5xx may come after the
+# records were written, so repeating the POST would duplicate them.
+
+_session = None
+_session_lock = threading.Lock()
+_settings = {}
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return int(default)
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def get_pool_size():
+    return _settings.get("pool_size") or _env_int("ZOHO_HTTP_POOL_SIZE", 10)
+
+
+def get_timeout():
+    connect_timeout = _settings.get("connect_timeout") or _env_float("ZOHO_HTTP_CONNECT_TIMEOUT", 10)
+    read_timeout = _settings.get("read_timeout") or _env_float("ZOHO_HTTP_READ_TIMEOUT", 60)
+    return (connect_timeout, read_timeout)
+
+
+def build_session(pool_size=None, transport=None, transport_prefix=None):
+    pool_size = pool_size or get_pool_size()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if transport is not None:
+        session.mount(transport_prefix or "https://", transport)
+        if not transport_prefix:
+            session.mount("http://", transport)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session(transport=_settings.get("transport"), transport_prefix=_settings.get("transport_prefix"))
+    return _session
+
+
+def configure(pool_size=None, connect_timeout=None, read_timeout=None, transport=None, transport_prefix=None):
+    global _session
+    with _session_lock:
+        if pool_size is not None:
+            _settings["pool_size"] = pool_size
+        if connect_timeout is not None:
+            _settings["connect_timeout"] = connect_timeout
+        if read_timeout is not None:
+            _settings["read_timeout"] = read_timeout
+        if transport is not None:
+            _settings["transport"] = transport
+            _settings["transport_prefix"] = transport_prefix
+        old_session = _session
+        _session = None
+    if old_session is not None:
+        old_session.close()
+
+
+def reset():
+    global _session
+    with _session_lock:
+        _settings.clear()
+        old_session = _session
+        _session = None
+    if old_session is not None:
+        old_session.close()
+
+
+# Statuses on which a non-idempotent request (an insert POST) is known not to have been applied.
+NOT_PROCESSED_STATUSES = (429, 503)
+
+
+def _replay_safe(method, url):
+    # GETs and upserts (matched on duplicate-check fields) give the same result when repeated.
+    return method.upper() in ("GET", "HEAD") or url.split("?", 1)[0].rstrip("/").endswith("/upsert")
+
+
+def _retry_delay(attempt, response=None):
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), _env_float("ZOHO_BACKOFF_MAX_SECONDS", 30))
+            except ValueError:
+                pass
+    base = _env_float("ZOHO_BACKOFF_BASE_SECONDS", 0.5)
+    cap = _env_float("ZOHO_BACKOFF_MAX_SECONDS", 30)
+    # Full jitter: sleep anywhere between 0 and the exponential ceiling.
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def request(method, url, timeout=None, retry=True, **kwargs):
+    limiter = get_rate_limiter()
+    max_retries = _env_int("ZOHO_MAX_RETRIES", 5) if retry else 0
+    replay_safe = _replay_safe(method, url)
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            response = get_session().request(method, url, timeout=timeout or get_timeout(), **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # An insert that may have reached Zoho is not replayed; only failed connects are safe to retry.
+            if attempt >= max_retries or (not replay_safe and not isinstance(e, requests.ConnectTimeout)):
+                raise
+            time.sleep(_retry_delay(attempt))
+            attempt += 1
+            continue
+        limiter.update_from_headers(response.headers)
+        if response.status_code == 429 or response.status_code >= 500:
+            if response.status_code == 429:
+                limiter.on_throttled()
+            if attempt < max_retries and (replay_safe or response.status_code in NOT_PROCESSED_STATUSES):
+                delay = _retry_delay(attempt, response)
+                print(f"⏳ Zoho returned {response.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                time.sleep(delay)
+                attempt += 1
+                continue
+        else:
+            limiter.on_success()
+        return response
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Local record of what has already been pushed to Zoho, keyed on the Planning
+# Permission No. and a hash of the source row. CMDA files are cumulative, so
+# re-imports use it to skip unchanged rows without any network call and to flag
+# rows whose content changed since the last push.
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+NEW = "new"
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+
+# Columns the import fills in itself. The Sales Person depends on the territory table and,
+# for shared territories, on the row's position in the batch; the Matched Keyword on the
+# configured keyword list. Neither is part of the source row, so both are left out of the hash.
+DERIVED_COLUMNS = ("Sales Person", "Matched Keyword")
+
+
+def _cell_text(value):
+    # Same text whether the cell came from read_excel (NaN, 5.0) or the streaming reader (None, 5).
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def source_hashes(df, exclude=DERIVED_COLUMNS):
+    # One hash per row of the source sheet, over its cells as text in column-name order.
+    # Hashing the source instead of the Zoho payload keeps the lead owner, the shared-territory
+    # split and the Record_<timestamp> name fallback from making unchanged rows look changed.
+    columns = sorted((str(name), name) for name in df.columns if name not in exclude)
+    header = "\x1f".join(label for label, _ in columns)
+    cells = [[_cell_text(value) for value in df[name].tolist()] for _, name in columns]
+    rows = zip(*cells) if cells else [()] * len(df)
+    join = "\x1f".join
+    return [hashlib.sha256(f"{header}\x1e{join(row)}".encode("utf-8")).hexdigest() for row in rows]
+
+
+class ImportLedger:
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS pushed_records ("
+                "target TEXT NOT NULL, planning_no TEXT NOT NULL, content_hash TEXT NOT NULL, "
+                "zoho_id TEXT, updated_at TEXT NOT NULL, PRIMARY KEY (target, planning_no))"
+            )
+
+    def classify(self, target, keyed_hashes):
+        keys = list({planning_no for planning_no, _ in keyed_hashes if planning_no})
+        known = {}
+        with self.lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT planning_no, content_hash FROM pushed_records WHERE target = ? AND planning_no IN ({placeholders})",
+                    [target, *batch],
+                ).fetchall()
+                known.update(rows)
+        statuses = []
+        for planning_no, payload_hash in keyed_hashes:
+            if not planning_no or planning_no not in known:
+                statuses.append(NEW)
+            elif known[planning_no] == payload_hash:
+                statuses.append(UNCHANGED)
+            else:
+                statuses.append(CHANGED)
+        return statuses
+
+    def record_results(self, target, pushed):
+        # pushed: iterable of (planning_no, content_hash, zoho_id) for records Zoho accepted.
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(target, planning_no, payload_hash, zoho_id, now) for planning_no, payload_hash, zoho_id in pushed if planning_no]
+        if not rows:
+            return
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO pushed_records (target, planning_no, content_hash, zoho_id, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(target, planning_no) DO UPDATE SET content_hash = excluded.content_hash, "
+                "zoho_id = COALESCE(excluded.zoho_id, pushed_records.zoho_id), updated_at = excluded.updated_at",
+                rows,
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def get_import_ledger():
+    global _ledger
+    path = os.getenv("IMPORT_LEDGER_PATH", "import_ledger.sqlite3")
+    if not path:
+        return None
+    if _ledger is None or _ledger.path != path:
+        with _ledger_lock:
+            if _ledger is None or _ledger.path != path:
+                _ledger = ImportLedger(path)
+    return _ledger
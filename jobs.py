@@ -0,0 +1,96 @@
+import os
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Lead imports run in a bounded thread pool so the API event loop never blocks on
+# Selenium, SMTP or Zoho calls. Job state lives in memory and is polled through
+# GET /api/jobs/{job_id}.
+
+_executor = None
+_executor_lock = threading.Lock()
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(os.getenv("IMPORT_WORKERS", "2")), thread_name_prefix="lead-import")
+    return _executor
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _prune_finished_jobs():
+    limit = int(os.getenv("IMPORT_JOB_HISTORY", "200"))
+    finished = [job for job in _jobs.values() if job["state"] in ("completed", "failed")]
+    if len(finished) <= limit:
+        return
+    finished.sort(key=lambda job: job["finished_at"])
+    for job in finished[:len(finished) - limit]:
+        _jobs.pop(job["job_id"], None)
+
+
+def submit_import(import_func, *args, **kwargs):
+    queue_limit = int(os.getenv("IMPORT_QUEUE_LIMIT", "20"))
+    with _jobs_lock:
+        pending = sum(1 for job in _jobs.values() if job["state"] in ("queued", "running"))
+        if pending >= queue_limit:
+            raise JobQueueFull(f"Too many imports in progress ({pending}). Please retry later.")
+        job_id = uuid.uuid4().hex
+        _jobs[job_id] = {
+            "job_id": job_id,
+            "state": "queued",
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "stage": None,
+            "stages": {},
+            "result": None,
+            "error": None,
+        }
+        _prune_finished_jobs()
+    get_executor().submit(_run_job, job_id, import_func, args, kwargs)
+    return job_id
+
+
+def update_progress(job_id, stage, **info):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        job["stage"] = stage
+        job["stages"].setdefault(stage, {}).update(info, updated_at=_now())
+
+
+def _run_job(job_id, import_func, args, kwargs):
+    with _jobs_lock:
+        _jobs[job_id].update(state="running", started_at=_now())
+    try:
+        result = import_func(*args, progress=lambda stage, **info: update_progress(job_id, stage, **info), **kwargs)
+        state = "completed" if result and result.get("status") else "failed"
+        error = None if state == "completed" else (result or {}).get("message")
+    except Exception as e:
+        traceback.print_exc()
+        result, state, error = None, "failed", str(e)
+    with _jobs_lock:
+        _jobs[job_id].update(state=state, result=result, error=error, finished_at=_now())
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        return {**job, "stages": {stage: dict(info) for stage, info in job["stages"].items()}}
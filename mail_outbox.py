@@ -0,0 +1,153 @@
+import atexit
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+import traceback
+
+# Report emails are queued here and sent by one background thread, so an import
+# never waits on the mail server. The thread keeps a single SMTP connection open
+# between messages, reconnects when it has gone stale and retries failed sends.
+# SMTP_HOST / SMTP_PORT / SMTP_USE_SSL can point it at a local stand-in such as
+# `python -m aiosmtpd -n -l localhost:1025`. The thread is a daemon, so whatever is
+# still queued is flushed (up to SMTP_FLUSH_TIMEOUT_SECONDS) when the process exits.
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def smtp_credentials():
+    # The one place the report sender and its SMTP password are read. There is no default
+    # password: without APP_PASSWORD the outbox sends without logging in (local relays only).
+    return os.getenv("SENDER_MAIL", "riverpearlsolutions@gmail.com"), os.getenv("APP_PASSWORD") or None
+
+
+class MailOutbox:
+
+    def __init__(self):
+        self.host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+        self.port = int(os.getenv("SMTP_PORT", "465"))
+        self.use_ssl = os.getenv("SMTP_USE_SSL", "true").strip().lower() in ("1", "true", "yes")
+        self.max_retries = int(os.getenv("SMTP_MAX_RETRIES", "3"))
+        self.idle_seconds = float(os.getenv("SMTP_IDLE_SECONDS", "60"))
+        self.sender, self.password = smtp_credentials()
+        # SMTP_CA_FILE trusts an extra CA, e.g. a self-signed certificate on a local relay.
+        self.ssl_context = ssl.create_default_context(cafile=os.getenv("SMTP_CA_FILE") or None)
+        self.queue = queue.Queue()
+        self.server = None
+        self.sent = 0
+        self.failed = 0
+        self.thread = threading.Thread(target=self._run, name="mail-outbox", daemon=True)
+        self.thread.start()
+
+    def enqueue(self, msg, recipients):
+        if not self.password:
+            print(f"⚠️ APP_PASSWORD is not set: '{msg['Subject']}' will be sent to {self.host}:{self.port} without logging in")
+        self.queue.put((msg, recipients))
+        return True
+
+    def flush(self, timeout=None):
+        deadline = time.monotonic() + timeout if timeout else None
+        while self.queue.unfinished_tasks:
+            if deadline and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=30, context=self.ssl_context)
+            server.ehlo()
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+            server.ehlo()
+            if server.has_extn("starttls"):
+                server.starttls(context=self.ssl_context)
+                server.ehlo()
+        # Always log in when a password is set: a server that does not offer AUTH then
+        # fails here, instead of rejecting every message with 530 later on.
+        if self.password:
+            server.login(self.sender, self.password)
+        return server
+
+    def _close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+
+    def _ensure_connection(self):
+        if self.server is not None:
+            try:
+                if self.server.noop()[0] == 250:
+                    return self.server
+            except Exception:
+                pass
+            self._close()
+        self.server = self._connect()
+        return self.server
+
+    def _send(self, msg, recipients):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._ensure_connection().sendmail(msg['From'] or self.sender, recipients, msg.as_string())
+                self.sent += 1
+                print(f"✅ Email '{msg['Subject']}' sent to {', '.join(recipients)}")
+                return True
+            except Exception as e:
+                self._close()
+                if attempt >= self.max_retries:
+                    self.failed += 1
+                    print(f"❌ Giving up on email '{msg['Subject']}': {e}")
+                    return False
+                delay = min(30, 2 ** attempt)
+                print(f"⚠️ Email send failed ({e}), retrying in {delay}s")
+                time.sleep(delay)
+
+    def _run(self):
+        while True:
+            try:
+                msg, recipients = self.queue.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                self._close()
+                continue
+            try:
+                self._send(msg, recipients)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self.queue.task_done()
+
+
+def get_outbox():
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = MailOutbox()
+    return _outbox
+
+
+def flush_outbox(timeout=None):
+    # Waits for queued mail before shutdown; never starts an outbox that was not used.
+    if _outbox is None:
+        return True
+    if timeout is None:
+        timeout = float(os.getenv("SMTP_FLUSH_TIMEOUT_SECONDS", "30"))
+    if _outbox.flush(timeout):
+        return True
+    print(f"⚠️ {_outbox.queue.unfinished_tasks} report email(s) still unsent at shutdown")
+    return False
+
+
+atexit.register(flush_outbox)
+
+
+def queue_email(msg, recipients):
+    if isinstance(recipients, str):
+        recipients = [recipients]
+    return get_outbox().enqueue(msg, recipients)
@@ -1,22 +1,130 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from python_multipart.multipart import MultipartParser, parse_options_header
+import os
 import uvicorn
 from model import FilePath
-from controller import lead_validation
+from controller import lead_validation, upload_validation, job_status
 app = FastAPI()
 
+def error_response(response, status_code, message):
+    response.status_code = status_code
+    return {
+        "message": message,
+        "statusCode": status_code,
+        "status": False,
+        "data": [{}]
+    }
+
 @app.post("/api/create_leads")
-async def create_leads(path: FilePath):
+async def create_leads(path: FilePath, response: Response):
     try:
-        response = lead_validation(path.file_path)
-        return response
+        result = lead_validation(path.file_path)
+        response.status_code = result["statusCode"]
+        return result
     except Exception as e:
         print("Error in create_leads:", str(e))
-        return {
-            "message": str(e),
-            "statusCode": 400,
-            "status": False,
-            "data": [{}]
-        }
+        return error_response(response, 400, str(e))
+
+class WorkbookUpload:
+    # Parses a multipart/form-data body as it streams in and keeps only the "file" field,
+    # in memory. Starlette's own form parsing would receive the whole body first and spool
+    # anything over 1 MB to a temporary file.
+
+    def __init__(self, boundary):
+        self.filename = None
+        self.chunks = []
+        self.headers = {}
+        self.header_field = b""
+        self.header_value = b""
+        self.in_file = False
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+        })
+
+    def on_part_begin(self):
+        self.headers = {}
+        self.in_file = False
+
+    def on_header_field(self, data, start, end):
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self.header_value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = self.header_value = b""
+
+    def on_headers_finished(self):
+        _, params = parse_options_header(self.headers.get(b"content-disposition", b""))
+        if params.get(b"name") == b"file" and self.filename is None:
+            self.in_file = True
+            self.filename = params.get(b"filename", b"").decode("utf-8", "replace")
+
+    def on_part_data(self, data, start, end):
+        if self.in_file:
+            self.chunks.append(data[start:end])
+
+    def write(self, chunk):
+        self.parser.write(chunk)
+
+    def finalize(self):
+        self.parser.finalize()
+        return b"".join(self.chunks)
+
+UPLOAD_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {"type": "object", "properties": {"file": {"type": "string", "format": "binary"}}, "required": ["file"]}}},
+    }
+}
+
+@app.post("/api/upload_leads", openapi_extra=UPLOAD_SCHEMA)
+async def upload_leads(request: Request, response: Response):
+    # The size limit is enforced while the body arrives: an oversized request is refused on
+    # its Content-Length, or as soon as the running byte count passes the limit.
+    try:
+        max_upload_bytes = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+        too_large = f"The uploaded file exceeds the {max_upload_bytes} byte limit."
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_upload_bytes:
+            return error_response(response, 413, too_large)
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+            return error_response(response, 400, "Upload the workbook as multipart/form-data in a field named 'file'.")
+        upload = WorkbookUpload(params[b"boundary"])
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_upload_bytes:
+                return error_response(response, 413, too_large)
+            upload.write(chunk)
+        content = upload.finalize()
+        if upload.filename is None:
+            return error_response(response, 400, "No file was uploaded in the 'file' field.")
+        result = upload_validation(upload.filename, content)
+        response.status_code = result["statusCode"]
+        return result
+    except Exception as e:
+        print("Error in upload_leads:", str(e))
+        return error_response(response, 400, str(e))
+
+@app.get("/api/jobs/{job_id}")
+async def get_import_job(job_id: str, response: Response):
+    result = job_status(job_id)
+    response.status_code = result["statusCode"]
+    return result
+
+@app.on_event("shutdown")
+def flush_report_emails():
+    # Imported here so smtplib stays off the startup path; the outbox may never have been used.
+    from mail_outbox import flush_outbox
+    flush_outbox()
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
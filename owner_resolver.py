@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+import traceback
+
+# Sales person name -> Zoho user ID, shared by every import in the process.
+# Active users are loaded from the Zoho Users API and indexed by normalized name
+# (full name, "first last", and first name alone when only one user has it).
+# The index is rebuilt after OWNER_CACHE_TTL_SECONDS. ZOHO_USER_ID_* env vars
+# still work, take precedence over whatever Zoho returns and are re-read on each load.
+# A push that Zoho rejects because of the owner field (e.g. the user was deactivated)
+# marks the index stale, so the next lookup reloads the users instead of waiting out the TTL.
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+OWNER_FIELDS = ("Owner", "Lead_Owner")
+
+OWNER_ENV_OVERRIDES = {
+    "Abhishek R G": "ZOHO_USER_ID_ABHISHEK",
+    "Karthik": "ZOHO_USER_ID_KARTHIK",
+    "Jagan": "ZOHO_USER_ID_JAGAN",
+    "Dinakaran": "ZOHO_USER_ID_DINAKARAN",
+    "Venkatesh": "ZOHO_USER_ID_VENKATESH",
+    "Ameen Syed": "ZOHO_USER_ID_AMEEN",
+    "Balachander": "ZOHO_USER_ID_BALACHANDER",
+    "Vijaya Kumar": "ZOHO_USER_ID_VIJAYA_KUMAR",
+}
+
+
+def normalize_name(name):
+    if name is None:
+        return ""
+    return " ".join(str(name).lower().split())
+
+
+def env_overrides():
+    overrides = {}
+    for name, env_var in OWNER_ENV_OVERRIDES.items():
+        user_id = os.getenv(env_var)
+        if user_id:
+            overrides[normalize_name(name)] = user_id
+    return overrides
+
+
+def is_owner_error(result):
+    # A per-record write result that Zoho rejected because of the owner lookup.
+    details = result.get("details") or {}
+    return result.get("status") == "error" and isinstance(details, dict) and details.get("api_name") in OWNER_FIELDS
+
+
+def build_user_index(users):
+    index = {}
+    ambiguous = set()
+    first_names = {}
+    for user in users:
+        user_id = user.get("id")
+        if not user_id:
+            continue
+        full_name = normalize_name(user.get("full_name"))
+        first_last = normalize_name(f"{user.get('first_name') or ''} {user.get('last_name') or ''}")
+        for key in {full_name, first_last}:
+            if not key:
+                continue
+            if key in index and index[key] != user_id:
+                ambiguous.add(key)
+            index[key] = user_id
+        first_name = normalize_name(user.get("first_name"))
+        if first_name:
+            first_names.setdefault(first_name, set()).add(user_id)
+    # A bare first name ("Karthik") only resolves when exactly one active user has it.
+    for first_name, user_ids in first_names.items():
+        if first_name not in index and len(user_ids) == 1:
+            index[first_name] = next(iter(user_ids))
+    for key in ambiguous:
+        print(f"⚠️ More than one active Zoho user is named '{key}'; set a ZOHO_USER_ID_* override to pick one")
+        del index[key]
+    return index
+
+
+class OwnerResolver:
+
+    def __init__(self, ttl_seconds=None, retry_seconds=None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("OWNER_CACHE_TTL_SECONDS", "3600"))
+        if retry_seconds is None:
+            retry_seconds = float(os.getenv("OWNER_CACHE_RETRY_SECONDS", "60"))
+        self.ttl = ttl_seconds
+        self.retry = retry_seconds
+        self.users = None
+        self.index = None
+        self.fetched_at = 0.0
+        self.failed_at = None
+        self.lock = threading.Lock()
+
+    def _stale(self):
+        # After a failed load, wait retry_seconds before asking Zoho again; a previously
+        # loaded index keeps serving in the meantime.
+        now = time.monotonic()
+        if self.failed_at is not None and now - self.failed_at < self.retry:
+            return False
+        return self.users is None or now - self.fetched_at >= self.ttl
+
+    def fetch_users(self, auth):
+        if not auth.api_base_url or not auth.ensure_valid_token():
+            return None
+        users = []
+        page = 1
+        while True:
+            response = auth.api_request("GET", f"{auth.api_base_url}/users", params={"type": "ActiveUsers", "page": page, "per_page": 200})
+            if response.status_code == 204:
+                break
+            if response.status_code != 200:
+                print(f"⚠️ Could not load Zoho users (HTTP {response.status_code}), using ZOHO_USER_ID_* overrides only")
+                return None
+            data = response.json()
+            users.extend(data.get("users", []))
+            if not data.get("info", {}).get("more_records"):
+                break
+            page += 1
+        return users
+
+    def _merge_overrides(self):
+        # Built once per load (or failed load) so lookups never copy the index or re-read the env.
+        index = dict(self.users or {})
+        index.update(env_overrides())
+        self.index = index
+
+    def get_index(self, auth, force_refresh=False):
+        # Returns the shared cached mapping; callers must not modify it.
+        if force_refresh or self._stale():
+            with self.lock:
+                if force_refresh or self._stale():
+                    try:
+                        users = self.fetch_users(auth)
+                    except Exception:
+                        traceback.print_exc()
+                        users = None
+                    if users is None:
+                        self.failed_at = time.monotonic()
+                    else:
+                        self.users = build_user_index(users)
+                        self.fetched_at = time.monotonic()
+                        self.failed_at = None
+                        print(f"👥 Loaded {len(users)} active Zoho users for owner assignment")
+                    self._merge_overrides()
+        return self.index
+
+    def resolve_many(self, names, auth):
+        # One index lookup for all distinct names of a batch; unknown names map to None.
+        index = self.get_index(auth)
+        return {name: index.get(normalize_name(name)) for name in set(names)}
+
+    def resolve(self, name, auth):
+        return self.get_index(auth).get(normalize_name(name))
+
+    def invalidate(self):
+        # Keeps serving the current index until the reload, so concurrent lookups never see None.
+        with self.lock:
+            self.fetched_at = float("-inf")
+            self.failed_at = None
+
+
+def get_owner_resolver():
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = OwnerResolver()
+    return _resolver
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+
+# Token bucket shared by every outbound Zoho call. The fill rate starts at
+# ZOHO_RATE_LIMIT_PER_SECOND, is halved on 429, creeps back up on success and is
+# capped by whatever the X-RATELIMIT-* response headers say is left in the window.
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class TokenBucket:
+
+    def __init__(self, rate, burst=None, min_rate=0.2):
+        if not rate > 0 or not min_rate > 0:
+            raise ValueError(f"Rate limits must be positive (rate={rate}, min_rate={min_rate})")
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        # Adaptive decreases and header caps never go below min_rate, so acquire() always has
+        # a positive fill rate to wait on.
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.capacity = float(burst or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.header_cap = None
+        self.header_cap_until = 0.0
+        self.lock = threading.Lock()
+
+    def _effective_rate(self, now):
+        if self.header_cap is not None and now < self.header_cap_until:
+            return max(self.min_rate, min(self.rate, self.header_cap))
+        return self.rate
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self._effective_rate(now))
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self._effective_rate(now)
+            time.sleep(wait)
+
+    def on_throttled(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+
+    def on_success(self):
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def update_from_headers(self, headers):
+        remaining = headers.get("X-RATELIMIT-REMAINING")
+        reset = headers.get("X-RATELIMIT-RESET")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = float(remaining)
+            reset_seconds = float(reset)
+        except (TypeError, ValueError):
+            return
+        # Zoho sends the reset either as seconds left or as an epoch timestamp in milliseconds.
+        if reset_seconds > 1e11:
+            reset_seconds = reset_seconds / 1000 - time.time()
+        elif reset_seconds > 1e9:
+            reset_seconds = reset_seconds - time.time()
+        if reset_seconds <= 0:
+            return
+        with self.lock:
+            self.header_cap = remaining / reset_seconds
+            self.header_cap_until = time.monotonic() + reset_seconds
+
+
+def get_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                rate = float(os.getenv("ZOHO_RATE_LIMIT_PER_SECOND", "10"))
+                if not rate > 0:
+                    print(f"⚠️ ZOHO_RATE_LIMIT_PER_SECOND must be positive, got {rate}; using 10")
+                    rate = 10.0
+                burst = float(os.getenv("ZOHO_RATE_LIMIT_BURST", "0"))
+                _limiter = TokenBucket(rate, burst if burst > 0 else None)
+    return _limiter
+
+
+def set_rate_limiter(limiter):
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
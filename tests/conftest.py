@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# The modules live flat in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import owner_resolver
+import rate_limiter
+import ZohoCRMAutomatedAuth as zoho_module
+from fake_zoho import FakeZoho
+
+
+@pytest.fixture(autouse=True)
+def isolated_singletons():
+    # Process-wide caches must not leak users, limits or module lists between tests.
+    owner_resolver._resolver = None
+    rate_limiter.set_rate_limiter(rate_limiter.TokenBucket(1e6))
+    zoho_module.invalidate_module_cache()
+    yield
+    owner_resolver._resolver = None
+    rate_limiter.set_rate_limiter(None)
+    zoho_module.invalidate_module_cache()
+
+
+@pytest.fixture
+def offline_crm(monkeypatch):
+    # A client that never talks to Zoho: owners come from the ZOHO_USER_ID_* overrides only.
+    monkeypatch.delenv("API_BASE_URL", raising=False)
+    monkeypatch.setenv("ZOHO_USER_ID_KARTHIK", "5000000000001")
+    monkeypatch.setenv("ZOHO_USER_ID_ABHISHEK", "5000000000002")
+    crm = zoho_module.ZohoCRMAutomatedAuth()
+    crm.ensure_valid_token = lambda: True
+    return crm
+
+
+@pytest.fixture
+def fake_zoho(tmp_path, monkeypatch):
+    fake = FakeZoho(modules=("Leads", "CMDA_Test"))
+    fake.start()
+    access_token, refresh_token = fake.issue_token()
+    token_file = tmp_path / "tokens.json"
+    token_file.write_text(json.dumps({"access_token": access_token, "refresh_token": refresh_token, "expires_at": (datetime.now() + timedelta(days=1)).isoformat()}))
+    for name, value in fake.env().items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setenv("TOKEN_FILE_NAME", str(token_file))
+    monkeypatch.setenv("ZOHO_MODEL_NAME", "CMDA_Test")
+    monkeypatch.setenv("IMPORT_LEDGER_PATH", str(tmp_path / "ledger.sqlite3"))
+    monkeypatch.setenv("ZOHO_UPSERT", "false")
+    yield fake
+    fake.stop()
+    from import_ledger import get_import_ledger
+    ledger = get_import_ledger()
+    if ledger:
+        ledger.close()
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import controller
+from benchmark import write_synthetic_workbook
+from main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    submitted = []
+
+    def submit_import(import_func, *args, **kwargs):
+        submitted.append((args, kwargs))
+        return "job-1"
+
+    monkeypatch.setattr(controller, "submit_import", submit_import)
+    test_client = TestClient(app)
+    test_client.submitted = submitted
+    return test_client
+
+
+def test_workbook_upload_is_queued(client, tmp_path):
+    path = tmp_path / "cmda.xlsx"
+    write_synthetic_workbook(str(path), 5)
+    response = client.post("/api/upload_leads", files={"file": ("cmda.xlsx", path.read_bytes())})
+    assert response.status_code == 202
+    assert response.json()["data"] == [{"job_id": "job-1"}]
+    assert client.submitted[0][1]["original_file_name"] == "cmda.xlsx"
+
+
+@pytest.mark.parametrize("name, content", [("cmda.xls", b"PK\x03\x04rest"), ("cmda.xlsx", b"garbage"), ("cmda.xlsx", b"")])
+def test_rejected_uploads_get_a_400_status(client, name, content):
+    response = client.post("/api/upload_leads", files={"file": (name, content)})
+    assert response.status_code == 400
+    assert response.json()["statusCode"] == 400
+    assert client.submitted == []
+
+
+def test_missing_file_field_gets_a_400_status(client):
+    response = client.post("/api/upload_leads", files={"other": ("cmda.xlsx", b"PK\x03\x04")})
+    assert response.status_code == 400
+
+
+def test_oversized_upload_gets_a_413_status(client, monkeypatch):
+    monkeypatch.setenv("MAX_UPLOAD_BYTES", "1000")
+    response = client.post("/api/upload_leads", files={"file": ("cmda.xlsx", b"PK\x03\x04" + b"x" * 2000)})
+    assert response.status_code == 413
+    assert client.submitted == []
+
+
+def test_unknown_file_path_gets_a_400_status(client, tmp_path):
+    response = client.post("/api/create_leads", json={"file_path": str(tmp_path / "missing.xlsx")})
+    assert response.status_code == 400
+    assert response.json()["statusCode"] == 400
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from benchmark import _copy_workbook_rows, write_synthetic_workbook
+from import_ledger import CHANGED, NEW, UNCHANGED, ImportLedger, source_hashes
+
+
+def test_source_hash_ignores_reader_and_derived_differences():
+    read_excel = pd.DataFrame({"Planning Permission No.": ["PP/1"], "Dwelling Unit Info": [5.0], "Email ID": [np.nan], "Sales Person": ["Jagan"]})
+    streamed = pd.DataFrame({"Email ID": [None], "Dwelling Unit Info": [5], "Planning Permission No.": [" PP/1 "], "Sales Person": ["Balachander"]})
+    assert source_hashes(read_excel) == source_hashes(streamed)
+
+
+def test_source_hash_changes_with_the_row_content():
+    before = pd.DataFrame({"Planning Permission No.": ["PP/1"], "Dwelling Unit Info": ["4 units"]})
+    after = before.assign(**{"Dwelling Unit Info": ["6 units"]})
+    assert source_hashes(before) != source_hashes(after)
+
+
+def test_classify_new_unchanged_and_changed(tmp_path):
+    ledger = ImportLedger(str(tmp_path / "ledger.sqlite3"))
+    ledger.record_results("Leads", [("PP/1", "a", "1"), ("PP/2", "b", "2"), ("", "c", "3")])
+    statuses = ledger.classify("Leads", [("PP/1", "a"), ("PP/2", "changed"), ("PP/3", "c"), ("", "c")])
+    assert statuses == [UNCHANGED, CHANGED, NEW, NEW]
+    assert ledger.classify("CMDA", [("PP/1", "a")]) == [NEW]
+    ledger.close()
+
+
+def test_filter_with_ledger_only_pushes_changed_rows_on_upsert(offline_crm, tmp_path, monkeypatch):
+    monkeypatch.setenv("IMPORT_LEDGER_PATH", str(tmp_path / "ledger.sqlite3"))
+    from import_ledger import get_import_ledger
+    get_import_ledger().record_results("Leads", [("PP/1", "a", "1"), ("PP/2", "b", "2")])
+    pending = [("PP/1", "a", "one"), ("PP/2", "b2", "two"), ("PP/3", "c", "three")]
+    to_push, skipped, changed = offline_crm.filter_with_ledger("Leads", pending)
+    assert (to_push, skipped, changed) == ([pending[2]], 1, [pending[1]])
+    to_push, skipped, changed = offline_crm.filter_with_ledger("Leads", pending, push_changed=True)
+    assert (to_push, skipped, changed) == (pending[1:], 1, [])
+    get_import_ledger().close()
+
+
+def test_superset_reimport_only_pushes_new_rows(fake_zoho, tmp_path):
+    from Integration import lead_import
+    superset, subset = str(tmp_path / "superset.xlsx"), str(tmp_path / "subset.xlsx")
+    write_synthetic_workbook(superset, 300)
+    _copy_workbook_rows(superset, subset, 250)
+    first = lead_import(subset, send_email=False)["data"][0]
+    second = lead_import(superset, send_email=False)["data"][0]
+    chunked = lead_import(superset, send_email=False, chunk_size=40)["data"][0]
+    for target in ("cmda", "leads"):
+        assert first[target]["successful"] > 0
+        assert second[target]["skipped"] == first[target]["successful"]
+        assert second[target]["successful"] > 0 and second[target]["changed"] == 0
+        assert chunked[target]["successful"] == 0 and chunked[target]["changed"] == 0
+
+
+def test_rows_the_ledger_skips_are_never_formatted(fake_zoho, tmp_path, monkeypatch):
+    from ZohoCRMAutomatedAuth import ZohoCRMAutomatedAuth
+    from helper import read_workbook
+    path = str(tmp_path / "cmda.xlsx")
+    write_synthetic_workbook(path, 120)
+    df = read_workbook(path)
+    crm = ZohoCRMAutomatedAuth()
+    assert crm.push_records_to_zoho(df.iloc[:100]) and crm.create_leads_from_cmda_records(df.iloc[:100])
+    formatted, built = [], []
+    format_records, build_leads = crm.format_records_for_zoho, crm.build_leads_data
+    monkeypatch.setattr(crm, "format_records_for_zoho", lambda records: formatted.append(len(records)) or format_records(records))
+    monkeypatch.setattr(crm, "build_leads_data", lambda records: built.append(len(records)) or build_leads(records))
+    assert crm.push_records_to_zoho(df)
+    results = crm.create_leads_from_cmda_records(df)
+    assert (formatted, built) == ([20], [20])
+    assert crm.last_push_stats["skipped"] == 100
+    assert [result["status"] for result in results].count("skipped") == 100
+    monkeypatch.setattr(crm, "format_records_for_zoho", lambda records: formatted.append(len(records)) or format_records(records))
+    assert crm.push_records_to_zoho(df) and crm.last_push_stats["skipped"] == 120
+    assert formatted == [20]
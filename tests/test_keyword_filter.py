@@ -0,0 +1,38 @@
+import pandas as pd
+
+from helper import compile_keyword_pattern, filter_development_records
+
+
+def frame(natures, dwelling=None):
+    return pd.DataFrame({"Nature of Development": natures, "Dwelling Unit Info": dwelling or [None] * len(natures)})
+
+
+def test_matched_rows_report_the_keyword_that_matched():
+    df = frame(["Proposed SCHOOL BUILDING", "Office block", "Residential with 8 Dwelling Units", "Proposed Mall", None])
+    matched, unmatched = filter_development_records(df)
+    assert matched.index.tolist() == [0, 2, 3]
+    assert matched["Matched Keyword"].tolist() == ["school building", "dwelling units", "mall"]
+    assert unmatched.index.tolist() == [1, 4]
+    assert "Matched Keyword" not in unmatched.columns
+
+
+def test_rows_with_a_dwelling_count_match_without_a_keyword():
+    df = frame(["Office block", "Office block", "Office block"], ["8 dwelling units", "  ", None])
+    matched, unmatched = filter_development_records(df)
+    assert matched.index.tolist() == [0]
+    assert matched["Matched Keyword"].isna().all()
+    assert unmatched.index.tolist() == [1, 2]
+
+
+def test_keywords_are_configurable(monkeypatch):
+    df = frame(["Proposed Warehouse", "Proposed Mall"])
+    monkeypatch.setenv("DEVELOPMENT_KEYWORDS", "Warehouse, godown")
+    matched, _ = filter_development_records(df)
+    assert matched["Matched Keyword"].tolist() == ["warehouse"]
+    matched, _ = filter_development_records(df, keywords=["mall"])
+    assert matched["Matched Keyword"].tolist() == ["mall"]
+
+
+def test_pattern_is_compiled_once_per_keyword_list():
+    assert compile_keyword_pattern(("a.b", "units")) is compile_keyword_pattern(("a.b", "units"))
+    assert compile_keyword_pattern(("a.b",)).search("axb") is None
@@ -0,0 +1,106 @@
+import shutil
+import subprocess
+import threading
+from email.mime.text import MIMEText
+
+import pytest
+
+import mail_outbox
+from benchmark import _SMTPStubServer
+from mail_outbox import MailOutbox, flush_outbox
+
+
+@pytest.fixture
+def smtp_stub(monkeypatch):
+    servers = []
+
+    def start(certfile=None, keyfile=None):
+        server = _SMTPStubServer("stub-password", certfile, keyfile)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setenv("SMTP_HOST", "localhost")
+        monkeypatch.setenv("SMTP_PORT", str(server.server_address[1]))
+        monkeypatch.setenv("SMTP_USE_SSL", "true" if certfile else "false")
+        monkeypatch.setenv("SMTP_MAX_RETRIES", "0")
+        monkeypatch.setenv("APP_PASSWORD", "stub-password")
+        if certfile:
+            monkeypatch.setenv("SMTP_CA_FILE", certfile)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def report(subject):
+    msg = MIMEText("report body")
+    msg["Subject"] = subject
+    msg["From"] = "reports@example.com"
+    msg["To"] = "team@example.com"
+    return msg
+
+
+def test_flush_waits_for_every_queued_email(smtp_stub):
+    server = smtp_stub()
+    outbox = MailOutbox()
+    for n in range(3):
+        outbox.enqueue(report(f"Report {n}"), ["team@example.com"])
+    assert outbox.flush(timeout=15)
+    outbox._close()
+    assert (outbox.sent, outbox.failed, server.delivered) == (3, 0, 3)
+    assert "AUTH" in server.commands
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl to make a test certificate")
+def test_ssl_connection_logs_in_before_sending(smtp_stub, tmp_path):
+    certfile, keyfile = str(tmp_path / "cert.pem"), str(tmp_path / "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+                    "-addext", "subjectAltName=DNS:localhost", "-keyout", keyfile, "-out", certfile], check=True, capture_output=True)
+    server = smtp_stub(certfile, keyfile)
+    outbox = MailOutbox()
+    outbox.enqueue(report("SSL report"), ["team@example.com"])
+    assert outbox.flush(timeout=15)
+    outbox._close()
+    assert (outbox.sent, server.delivered) == (1, 1)
+
+
+def test_flush_outbox_is_a_no_op_when_nothing_was_queued(monkeypatch):
+    monkeypatch.setattr(mail_outbox, "_outbox", None)
+    assert flush_outbox(timeout=1)
+
+
+def test_flush_outbox_reports_mail_still_pending(smtp_stub, monkeypatch):
+    smtp_stub()
+    outbox = MailOutbox()
+    release = threading.Event()
+    monkeypatch.setattr(outbox, "_send", lambda msg, recipients: release.wait(5))
+    monkeypatch.setattr(mail_outbox, "_outbox", outbox)
+    outbox.enqueue(report("Slow report"), ["team@example.com"])
+    assert not flush_outbox(timeout=0.2)
+    release.set()
+    assert flush_outbox(timeout=5)
+
+
+def test_unset_password_is_flagged_when_mail_is_queued(monkeypatch, capsys):
+    monkeypatch.delenv("APP_PASSWORD", raising=False)
+    monkeypatch.setenv("SENDER_MAIL", "reports@example.com")
+    assert mail_outbox.smtp_credentials() == ("reports@example.com", None)
+    outbox = MailOutbox()
+    monkeypatch.setattr(outbox, "_send", lambda msg, recipients: True)
+    assert outbox.enqueue(report("Unauthenticated report"), ["team@example.com"])
+    assert outbox.flush(timeout=5)
+    assert "APP_PASSWORD is not set" in capsys.readouterr().out
+
+
+def test_report_alerts_read_the_same_password_setting(monkeypatch):
+    import pandas as pd
+    import helper
+    sent = []
+    monkeypatch.delenv("APP_PASSWORD", raising=False)
+    monkeypatch.setenv("RECIPIENT_MAIL", "team@example.com")
+    monkeypatch.setattr(helper, "queue_email", lambda msg, recipients: sent.append(msg) or True)
+    unmatched = pd.DataFrame({"Area Name": ["Nowhere"]})
+    assert helper.send_unmatched_areas_alert(unmatched)
+    assert helper.send_records_alert(pd.DataFrame(), unmatched)
+    assert len(sent) == 2
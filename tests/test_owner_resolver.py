@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from owner_resolver import get_owner_resolver, is_owner_error
+from ZohoCRMAutomatedAuth import ZohoCRMAutomatedAuth
+
+
+def records(start, count, sales_person="Jagan"):
+    return pd.DataFrame({
+        "Planning Permission No.": [f"PP/{n}" for n in range(start, start + count)],
+        "Applicant Name": [f"Applicant {n}" for n in range(start, start + count)],
+        "Sales Person": [sales_person] * count,
+    })
+
+
+def test_owner_errors_are_recognised():
+    assert is_owner_error({"status": "error", "code": "INVALID_DATA", "details": {"api_name": "Owner"}})
+    assert is_owner_error({"status": "error", "code": "INVALID_DATA", "details": {"api_name": "Lead_Owner"}})
+    assert not is_owner_error({"status": "error", "code": "INVALID_DATA", "details": {"api_name": "Email"}})
+    assert not is_owner_error({"status": "success", "details": {"id": "1"}})
+
+
+def test_invalidate_keeps_serving_the_index_until_the_reload(fake_zoho):
+    crm = ZohoCRMAutomatedAuth()
+    resolver = get_owner_resolver()
+    assert resolver.resolve("Jagan", crm) == "4000000000003"
+    resolver.invalidate()
+    assert resolver.index is not None
+    with fake_zoho.lock:
+        fake_zoho.users = [user for user in fake_zoho.users if user["first_name"] != "Jagan"]
+    assert resolver.resolve("Jagan", crm) is None
+
+
+def push_cmda(crm, df):
+    crm.push_records_to_zoho(df)
+    return crm.last_push_stats["successful"]
+
+
+def push_leads(crm, df):
+    return sum(result["status"] == "success" for result in crm.create_leads_from_cmda_records(df))
+
+
+@pytest.mark.parametrize("push", [push_cmda, push_leads])
+def test_rejected_owner_reloads_the_users_before_the_next_push(fake_zoho, push):
+    # Jagan is deactivated after the owner index was loaded: the next push is rejected for the
+    # owner, and the one after it reloads the users instead of sending the stale ID again.
+    fake_zoho.check_owners = True
+    crm = ZohoCRMAutomatedAuth()
+    assert push(crm, records(0, 3)) == 3
+    with fake_zoho.lock:
+        fake_zoho.users = [user for user in fake_zoho.users if user["first_name"] != "Jagan"]
+    assert push(crm, records(3, 3)) == 0
+    assert push(crm, records(6, 3)) == 3
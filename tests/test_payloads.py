@@ -0,0 +1,35 @@
+import json
+import re
+
+from benchmark import synthetic_cmda_frame
+from helper import dataframe_to_records
+
+
+def serialized(payloads):
+    # Rows with no applicant or company are named Record_<now>, so the clock is masked out.
+    return [re.sub(r"Record_\d{14}", "Record_", json.dumps(payload, ensure_ascii=False)) for payload in payloads]
+
+
+def test_column_wise_cmda_payloads_match_per_record_formatter(offline_crm):
+    df = synthetic_cmda_frame(2000)
+    legacy = [offline_crm.format_record_for_zoho(record) for record in dataframe_to_records(df)]
+    assert serialized(offline_crm.format_records_for_zoho(df)) == serialized(legacy)
+
+
+def test_column_wise_lead_payloads_match_per_record_builder(offline_crm):
+    df = synthetic_cmda_frame(2000)
+    legacy = []
+    for record in df.to_dict("records"):
+        try:
+            legacy.append(offline_crm.build_lead_data(record, verbose=False))
+        except Exception as e:
+            legacy.append(f"error: {e}")
+    payloads, errors = offline_crm.build_leads_data(df)
+    batch = [f"error: {errors[row]}" if row in errors else payload for row, payload in enumerate(payloads)]
+    assert serialized(batch) == serialized(legacy)
+
+
+def test_owner_ids_come_from_the_overrides(offline_crm):
+    df = synthetic_cmda_frame(200)
+    owners = {payload["Lead_Owner"] for payload in offline_crm.format_records_for_zoho(df[df["Sales Person"] == "Karthik"])}
+    assert owners == {"5000000000001"}
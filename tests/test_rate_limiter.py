@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+import rate_limiter
+from rate_limiter import TokenBucket
+
+
+@pytest.mark.parametrize("rate, min_rate", [(0, 0.2), (-1, 0.2), (float("nan"), 0.2), (5, 0)])
+def test_non_positive_rates_are_rejected(rate, min_rate):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, min_rate=min_rate)
+
+
+def test_throttling_never_drops_below_the_minimum_rate():
+    bucket = TokenBucket(1, min_rate=0.5)
+    for _ in range(10):
+        bucket.on_throttled()
+    assert bucket.rate == 0.5
+    assert TokenBucket(0.1).min_rate == 0.1
+
+
+def test_an_exhausted_header_window_still_lets_acquire_wait():
+    bucket = TokenBucket(1000, burst=1, min_rate=100)
+    bucket.update_from_headers({"X-RATELIMIT-REMAINING": "0", "X-RATELIMIT-RESET": "60"})
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started < 1
+
+
+def test_a_non_positive_configured_rate_falls_back_to_the_default(monkeypatch):
+    monkeypatch.setenv("ZOHO_RATE_LIMIT_PER_SECOND", "0")
+    rate_limiter.set_rate_limiter(None)
+    assert rate_limiter.get_rate_limiter().max_rate == 10
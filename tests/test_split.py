@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from benchmark import _legacy_split_shared_assignments, _sample_areas
+from helper import lookup_sales_persons, split_shared_assignments
+
+
+def assigned_frame(rows):
+    df = pd.DataFrame({"Row": range(rows), "Area Name": _sample_areas(rows)})
+    df["Sales Person"] = lookup_sales_persons(df["Area Name"])
+    return df
+
+
+def rows_of(df):
+    return df.astype(object).fillna("").values.tolist()
+
+
+def test_block_split_matches_iterrows_implementation():
+    df = assigned_frame(3000)
+    assert rows_of(split_shared_assignments(df, "Sales Person")) == rows_of(_legacy_split_shared_assignments(df, "Sales Person"))
+
+
+def test_block_split_gives_the_remainder_to_the_first_people():
+    df = pd.DataFrame({"Row": range(5), "Sales Person": ["Jagan / Balachander"] * 5})
+    assert split_shared_assignments(df, "Sales Person")["Sales Person"].tolist() == ["Jagan"] * 3 + ["Balachander"] * 2
+
+
+def test_round_robin_split_alternates_within_each_group():
+    df = pd.DataFrame({"Row": range(5), "Sales Person": ["Jagan / Balachander", "Karthik", "Jagan/Balachander", "Jagan / Balachander", "Jagan / Balachander"]})
+    split = split_shared_assignments(df, "Sales Person", mode="round_robin")
+    assert split["Row"].tolist() == [1, 0, 2, 3, 4]
+    assert split["Sales Person"].tolist() == ["Karthik", "Jagan", "Balachander", "Jagan", "Balachander"]
+
+
+def test_frame_without_shared_territories_is_returned_unchanged():
+    df = pd.DataFrame({"Sales Person": ["Karthik", None, "Jagan"]})
+    assert split_shared_assignments(df, "Sales Person") is df
+
+
+def test_unknown_split_mode_is_rejected():
+    with pytest.raises(ValueError):
+        split_shared_assignments(assigned_frame(10), "Sales Person", mode="random")
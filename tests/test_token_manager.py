@@ -0,0 +1,81 @@
+import threading
+from datetime import datetime, timedelta
+
+from token_manager import TokenManager
+from ZohoCRMAutomatedAuth import ZohoCRMAutomatedAuth
+
+
+class StubAuth:
+    # Stands in for ZohoCRMAutomatedAuth: counts refreshes and browser logins.
+
+    def __init__(self, manager, refresh_works=True):
+        self.manager = manager
+        self.refresh_works = refresh_works
+        self.refreshes = 0
+        self.logins = 0
+
+    def load_tokens(self):
+        return False
+
+    def refresh_access_token(self):
+        self.refreshes += 1
+        if self.refresh_works:
+            self.manager.access_token = f"token-{self.refreshes}"
+            self.manager.token_expires_at = datetime.now() + timedelta(hours=1)
+        return self.refresh_works
+
+    def automate_oauth_flow(self):
+        self.logins += 1
+        return False
+
+
+def manager_with_token(expires_in_seconds):
+    manager = TokenManager(refresh_margin_seconds=300, refresh_retry_seconds=30)
+    manager.access_token, manager.refresh_token = "token-0", "refresh"
+    manager.token_expires_at = datetime.now() + timedelta(seconds=expires_in_seconds)
+    manager.loaded = True
+    return manager
+
+
+def test_failed_early_refresh_keeps_the_current_token():
+    manager = manager_with_token(120)
+    auth = StubAuth(manager, refresh_works=False)
+    assert manager.ensure_valid_token(auth)
+    assert manager.ensure_valid_token(auth)
+    assert (auth.refreshes, auth.logins, manager.access_token) == (1, 0, "token-0")
+
+
+def test_browser_login_only_runs_once_the_token_has_expired():
+    manager = manager_with_token(-1)
+    auth = StubAuth(manager, refresh_works=False)
+    assert not manager.ensure_valid_token(auth)
+    assert (auth.refreshes, auth.logins) == (1, 1)
+
+
+def test_invalidating_a_rejected_token_refreshes_once_for_all_callers():
+    manager = manager_with_token(3600)
+    auth = StubAuth(manager)
+    rejected = manager.access_token
+
+    def hit_401():
+        manager.invalidate(rejected)
+        manager.ensure_valid_token(auth)
+
+    threads = [threading.Thread(target=hit_401) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert auth.refreshes == 1
+    assert manager.access_token == "token-1"
+
+
+def test_api_request_refreshes_and_retries_after_a_401(fake_zoho):
+    crm = ZohoCRMAutomatedAuth()
+    assert crm.ensure_valid_token()
+    with fake_zoho.lock:
+        fake_zoho.access_tokens.clear()
+    response = crm.api_request("GET", f"{crm.api_base_url}/settings/modules")
+    assert response.status_code == 200
+    stats = fake_zoho.stats()
+    assert (stats["unauthorized"], stats["tokens_issued"]) == (1, 2)
@@ -0,0 +1,88 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+# Token state shared by every ZohoCRMAutomatedAuth instance in the process.
+# Tokens are read from TOKEN_FILE_NAME once, refreshed a few minutes before they
+# expire, and only one caller at a time runs the refresh (or the Selenium flow);
+# everyone else waits for it and reuses the result. A failed early refresh keeps
+# the current token in use until it really expires; the Selenium flow only runs
+# when no usable token is left. A 401 from Zoho expires the token straight away.
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+class TokenManager:
+
+    def __init__(self, token_file=None, refresh_margin_seconds=None, refresh_retry_seconds=None):
+        if refresh_margin_seconds is None:
+            refresh_margin_seconds = int(os.getenv("TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+        if refresh_retry_seconds is None:
+            refresh_retry_seconds = float(os.getenv("TOKEN_REFRESH_RETRY_SECONDS", "30"))
+        self.token_file = token_file
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self.refresh_retry = timedelta(seconds=refresh_retry_seconds)
+        self.access_token = None
+        self.refresh_token = None
+        self.token_expires_at = None
+        self.refresh_failed_at = None
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def needs_refresh(self):
+        if not self.access_token:
+            return True
+        if self.token_expires_at and datetime.now() >= self.token_expires_at - self.refresh_margin:
+            return True
+        return False
+
+    def expired(self):
+        if not self.access_token:
+            return True
+        return self.token_expires_at is not None and datetime.now() >= self.token_expires_at
+
+    def _refresh_backing_off(self):
+        # After a failed early refresh, callers keep the still-valid token for refresh_retry
+        # instead of each paying another round trip to the token endpoint.
+        return not self.expired() and self.refresh_failed_at is not None and datetime.now() - self.refresh_failed_at < self.refresh_retry
+
+    def ensure_valid_token(self, auth):
+        if self.loaded and (not self.needs_refresh() or self._refresh_backing_off()):
+            return True
+        with self.lock:
+            if not self.loaded:
+                if not self.access_token:
+                    auth.load_tokens()
+                self.loaded = True
+            if not self.needs_refresh() or self._refresh_backing_off():
+                return True
+            if self.access_token and self.refresh_token:
+                print("🔄 Access token expires soon, refreshing...")
+                if auth.refresh_access_token():
+                    self.refresh_failed_at = None
+                    return True
+            if not self.expired():
+                self.refresh_failed_at = datetime.now()
+                print(f"⚠️ Could not refresh the access token; using the current one until it expires at {self.token_expires_at}")
+                return True
+            return auth.automate_oauth_flow()
+
+    def invalidate(self, access_token=None):
+        # Zoho rejected access_token (401). Only that token is expired: when several callers
+        # hit the same 401, the first one refreshes and the rest find a new token in place.
+        with self.lock:
+            if access_token is None or access_token == self.access_token:
+                self.token_expires_at = datetime.now()
+                self.refresh_failed_at = None
+
+
+def get_token_manager(token_file=None):
+    manager = _managers.get(token_file)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.get(token_file)
+            if manager is None:
+                manager = TokenManager(token_file)
+                _managers[token_file] = manager
+    return manager